@@ -0,0 +1,95 @@
+"""
+Memory held by the card catalog: CreditCardInfo dicts vs CardRecord objects.
+
+Cards are decoded from JSON first, as they arrive from Supabase, so every
+string starts out as its own object. Run from the repository root:
+
+    python -m benchmarks.card_memory [--cards N] [--snapshot PATH]
+"""
+
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+from typing import Any, Callable, Dict, List
+from credit_card_comparison_site.catalog.models import CardRecord, CreditCardInfo
+from credit_card_comparison_site.catalog.snapshot import (
+    CARD_FIELDS,
+    _to_columns,
+    read_snapshot,
+)
+
+ISSUERS = [
+    "Chase", "American Express", "Capital One", "Citi", "Discover",
+    "Wells Fargo", "Bank of America", "U.S. Bank", "Barclays", "HSBC",
+]
+APRS = ["20.49% - 28.49% Variable", "19.24% - 29.99% Variable", "N/A"]
+INTRO_APRS = ["0% for 15 months", "0% for 12 months", "N/A"]
+BONUSES = ["$200 after $500 spend", "60,000 points after $4,000 spend", "N/A"]
+
+
+def synthetic_cards(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Cards with the value repetition of a real catalog."""
+    rng = random.Random(seed)
+    cards = []
+    for i in range(count):
+        issuer = rng.choice(ISSUERS)
+        cards.append({
+            "id": str(100000 + i),
+            "name": f"{issuer} Card {i}",
+            "issuer_logo_url": f"/icons/issuers-sprite.svg#{issuer.lower()}",
+            "annual_fee": rng.choice([0, 0, 0, 95, 250, 550, 695]),
+            "rewards_general_spend_pct": rng.choice([1.0, 1.5, 2.0]),
+            "rewards_dining_pct": rng.choice([1.0, 2.0, 3.0, 4.0]),
+            "rewards_travel_pct": rng.choice([1.0, 2.0, 5.0]),
+            "rewards_gas_pct": rng.choice([1.0, 2.0, 3.0]),
+            "rewards_grocery_pct": rng.choice([1.0, 3.0, 6.0]),
+            "welcome_bonus": rng.choice(BONUSES),
+            "intro_apr_purchase": rng.choice(INTRO_APRS),
+            "intro_apr_balance_transfer": rng.choice(INTRO_APRS),
+            "regular_apr": rng.choice(APRS),
+            "issuer": issuer,
+            "issuer_id": str(ISSUERS.index(issuer) + 1),
+            "other_notes": rng.choice(["N/A", f"Note for card {i}"]),
+        })
+    return cards
+
+
+def retained_bytes(payload: str, build: Callable[[Dict[str, Any]], Any]) -> int:
+    """Bytes still allocated after building the catalog from payload."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    catalog = [build(row) for row in json.loads(payload)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del catalog
+    return after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=20000)
+    parser.add_argument("--snapshot", help="Use a catalog snapshot file instead")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        cards, _ = read_snapshot(args.snapshot)
+        columns = _to_columns(cards, CARD_FIELDS)
+        rows = [dict(zip(CARD_FIELDS, values)) for values in zip(*columns.values())]
+    else:
+        rows = synthetic_cards(args.cards)
+    payload = json.dumps(rows)
+
+    as_dicts = retained_bytes(payload, lambda row: CreditCardInfo(**row))
+    as_records = retained_bytes(payload, lambda row: CardRecord(**row))
+    print(f"cards:       {len(rows)}")
+    print(f"dicts:       {as_dicts / 1024:10.1f} KiB ({as_dicts / len(rows):.0f} B/card)")
+    print(f"CardRecord:  {as_records / 1024:10.1f} KiB ({as_records / len(rows):.0f} B/card)")
+    print(f"reduction:   {as_dicts / as_records:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+Read-only JSON API for cards, issuers and comparisons.
+
+Responses are encoded once per catalog version and request, kept gzipped
+in a per-worker LRU, and carry strong ETags so CDNs, reverse proxies and
+partner integrations can cache them and revalidate with If-None-Match.
+Mounted on the Reflex backend through rx.App(api_transformer=api).
+"""
+
+import gzip
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from credit_card_comparison_site.catalog.models import as_card_info
+from credit_card_comparison_site.catalog.client import SupabaseNotConfiguredError
+from credit_card_comparison_site.catalog.cache import CatalogSnapshot, catalog_cache
+from credit_card_comparison_site.catalog.comparison import (
+    comparison_cache,
+    pair_access_counts,
+)
+from credit_card_comparison_site.catalog.search import (
+    filter_match_cache,
+    intersect_positions,
+)
+from credit_card_comparison_site.catalog.settings import (
+    API_CACHE_MAX_AGE_SECONDS,
+    API_RESPONSE_CACHE_SIZE,
+)
+from credit_card_comparison_site.utils.compare_pages import (
+    PRERENDERED_PATH,
+    read_prerendered_file,
+)
+from credit_card_comparison_site.utils.issuer_icons import (
+    ICON_ASSETS_PATH,
+    read_icon_file,
+)
+
+MAX_PAGE_LIMIT = 1000
+
+# For URLs whose content never changes, such as content-hashed names
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class EncodedResponse:
+    """A JSON body in identity and gzip encodings, with an ETag for each."""
+
+    __slots__ = ("body", "gzipped", "etag", "gzip_etag")
+
+    def __init__(self, payload: Any):
+        self.body = json.dumps(
+            payload, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+        self.gzipped = gzip.compress(self.body, mtime=0)
+        # Hashing the body rather than using the version number keeps
+        # ETags equal across workers, whose version counters are independent
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+
+class ResponseCache:
+    """
+    LRU of encoded responses for this worker process.
+
+    Args:
+        max_entries (int): Responses kept before the least recently used is dropped
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._responses: "OrderedDict[Tuple[int, Hashable], EncodedResponse]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        catalog_version: int,
+        key: Hashable,
+        build: Callable[[], Any],
+    ) -> EncodedResponse:
+        """
+        The encoded response for key, building its payload on a miss.
+
+        Args:
+            catalog_version (int): Version the payload is built from
+            key: Identifies the request within that version
+            build: Returns the JSON payload; exceptions are not cached
+
+        Returns:
+            EncodedResponse: The shared encoded response
+        """
+        cache_key = (catalog_version, key)
+        encoded = self._responses.get(cache_key)
+        if encoded is not None:
+            self.hits += 1
+            self._responses.move_to_end(cache_key)
+            return encoded
+        self.misses += 1
+        encoded = EncodedResponse(build())
+        self._responses[cache_key] = encoded
+        while len(self._responses) > self.max_entries:
+            self._responses.popitem(last=False)
+        return encoded
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._responses),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+response_cache = ResponseCache(API_RESPONSE_CACHE_SIZE)
+
+api = FastAPI(title="Credit Card Comparison API")
+
+
+def _etag_matches(if_none_match: Optional[str], etags: Tuple[str, ...]) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }
+    return any(etag in candidates for etag in etags)
+
+
+def _respond(
+    request: Request,
+    encoded: EncodedResponse,
+    cache_control: str = f"public, max-age={API_CACHE_MAX_AGE_SECONDS}",
+) -> Response:
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+    headers = {
+        "ETag": encoded.gzip_etag if use_gzip else encoded.etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    # Either encoding's tag proves the client holds the same content
+    if _etag_matches(
+        request.headers.get("if-none-match"),
+        (encoded.etag, encoded.gzip_etag),
+    ):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(
+            encoded.gzipped, media_type="application/json", headers=headers
+        )
+    return Response(encoded.body, media_type="application/json", headers=headers)
+
+
+async def _snapshot() -> CatalogSnapshot:
+    try:
+        return await catalog_cache.get()
+    except SupabaseNotConfiguredError as e:
+        print(e)
+        raise HTTPException(status_code=503, detail="Catalog is not configured")
+    except Exception as e:
+        print(f"Error loading the card catalog: {e}")
+        raise HTTPException(status_code=503, detail="Catalog is unavailable")
+
+
+async def _cached_response(
+    request: Request,
+    key: Hashable,
+    build: Callable[[CatalogSnapshot], Any],
+) -> Response:
+    snapshot = await _snapshot()
+    encoded = response_cache.get(
+        snapshot.version, key, lambda: build(snapshot)
+    )
+    return _respond(request, encoded)
+
+
+def _matching_positions(
+    snapshot: CatalogSnapshot, name: str, issuer: str
+) -> List[int]:
+    # Same matching as the name and issuer filters on the main page
+    positions = None
+    for field_name, query in (("name", name), ("issuer", issuer)):
+        if query:
+            matches = snapshot.search_index(field_name).search(query)
+            positions = (
+                matches
+                if positions is None
+                else intersect_positions(positions, matches)
+            )
+    if positions is None:
+        return list(range(len(snapshot.cards)))
+    return positions
+
+
+@api.get("/api/cards")
+async def list_cards(
+    request: Request,
+    name: str = "",
+    issuer: str = "",
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
+) -> Response:
+    """Cards whose name and issuer contain the given text, one page at a time."""
+
+    def build(snapshot: CatalogSnapshot) -> Dict[str, Any]:
+        positions = _matching_positions(snapshot, name, issuer)
+        return {
+            "total": len(positions),
+            "offset": offset,
+            "limit": limit,
+            "cards": [
+                as_card_info(snapshot.cards[position])
+                for position in positions[offset:offset + limit]
+            ],
+        }
+
+    key = ("cards", name.lower(), issuer.lower(), offset, limit)
+    return await _cached_response(request, key, build)
+
+
+@api.get("/api/cards/{card_id}")
+async def get_card(request: Request, card_id: str) -> Response:
+    def build(snapshot: CatalogSnapshot) -> Dict[str, Any]:
+        card = snapshot.cards_by_id.get(card_id)
+        if card is None:
+            raise HTTPException(status_code=404, detail="Card not found")
+        return as_card_info(card)
+
+    return await _cached_response(request, ("card", card_id), build)
+
+
+@api.get("/api/issuers")
+async def list_issuers(request: Request) -> Response:
+    def build(snapshot: CatalogSnapshot) -> List[Dict[str, Any]]:
+        return [dict(issuer) for issuer in snapshot.issuers]
+
+    return await _cached_response(request, ("issuers",), build)
+
+
+@api.get("/api/compare/{card1_id}/{card2_id}")
+async def compare_cards(
+    request: Request, card1_id: str, card2_id: str
+) -> Response:
+    """Both cards and the formatted comparison rows shown on the compare page."""
+
+    def build(snapshot: CatalogSnapshot) -> Dict[str, Any]:
+        cards = [
+            snapshot.cards_by_id.get(card_id)
+            for card_id in (card1_id, card2_id)
+        ]
+        if None in cards or card1_id == card2_id:
+            raise HTTPException(status_code=404, detail="Card not found")
+        return {
+            "cards": [as_card_info(card) for card in cards],
+            "rows": comparison_cache.rows(snapshot.version, cards),
+        }
+
+    response = await _cached_response(
+        request, ("compare", card1_id, card2_id), build
+    )
+    pair_access_counts.record([card1_id, card2_id])
+    return response
+
+
+@api.get("/api/catalog/{fingerprint}")
+async def client_catalog(request: Request, fingerprint: str) -> Response:
+    """
+    Every card as shown in the browser, for CATALOG_CLIENT_IDS_ONLY.
+
+    Addressed by the catalog's content fingerprint, so the browser fetches
+    each catalog once and may cache it forever; sessions only send
+    positions into it.
+    """
+    await _snapshot()
+    for snapshot in catalog_cache.retained_snapshots():
+        if snapshot.client_fingerprint == fingerprint:
+            encoded = response_cache.get(
+                snapshot.version,
+                ("catalog",),
+                lambda: {"fingerprint": fingerprint, "cards": snapshot.client_cards},
+            )
+            return _respond(request, encoded, IMMUTABLE_CACHE_CONTROL)
+    raise HTTPException(status_code=404, detail="Catalog version not found")
+
+
+@api.get("/api/stats/popular-pairs")
+async def popular_pairs(
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
+) -> List[Dict[str, Any]]:
+    """Most compared card pairs on this worker, for choosing pages to prerender."""
+    return [
+        {"card_ids": list(card_ids), "count": count}
+        for card_ids, count in pair_access_counts.most_common(limit)
+    ]
+
+
+@api.get("/api/stats/caches")
+async def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Sizes and hit counters of this worker's caches, for monitoring."""
+    return {
+        "catalog": catalog_cache.stats(),
+        "comparisons": comparison_cache.stats(),
+        "api_responses": response_cache.stats(),
+        "filters": filter_match_cache.stats(),
+    }
+
+
+@api.get(PRERENDERED_PATH + "/{file_name}")
+async def prerendered_compare_page(request: Request, file_name: str) -> Response:
+    """
+    A prerendered compare page or its JSON, read from the current export.
+
+    Served by the backend so a new export is live without rebuilding the
+    frontend.
+    """
+    page = read_prerendered_file(file_name)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Page not prerendered")
+    content, media_type, etag = page
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={API_CACHE_MAX_AGE_SECONDS}",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), (etag,)):
+        return Response(status_code=304, headers=headers)
+    return Response(content, media_type=media_type, headers=headers)
+
+
+@api.get(ICON_ASSETS_PATH + "/{file_name}")
+async def icon_file(request: Request, file_name: str) -> Response:
+    """
+    A content-hashed icon, cacheable forever.
+
+    Card rows link here when ICON_BASE_URL points at the backend.
+    """
+    icon = read_icon_file(file_name)
+    if icon is None:
+        raise HTTPException(status_code=404, detail="Icon not found")
+    content, etag = icon
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+    }
+    if _etag_matches(request.headers.get("if-none-match"), (etag,)):
+        return Response(status_code=304, headers=headers)
+    return Response(content, media_type="image/svg+xml", headers=headers)
@@ -0,0 +1,28 @@
+"""
+Catalog loading and caching for the credit card comparison site.
+"""
+
+from .models import IssuerInfo, CreditCardInfo, CreditCardFeatureRow
+from .client import SupabaseNotConfiguredError, get_supabase_client
+from .sources import (
+    CatalogSource,
+    SupabaseCatalogSource,
+    SnapshotCatalogSource,
+    get_catalog_source,
+)
+from .cache import CatalogSnapshot, CatalogCache, catalog_cache
+
+__all__ = [
+    'IssuerInfo',
+    'CreditCardInfo',
+    'CreditCardFeatureRow',
+    'SupabaseNotConfiguredError',
+    'get_supabase_client',
+    'CatalogSource',
+    'SupabaseCatalogSource',
+    'SnapshotCatalogSource',
+    'get_catalog_source',
+    'CatalogSnapshot',
+    'CatalogCache',
+    'catalog_cache',
+]
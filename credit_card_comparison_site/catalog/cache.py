@@ -0,0 +1,304 @@
+"""
+Process-wide catalog cache.
+
+The card catalog changes rarely, so every session on a worker shares one
+loaded copy. Once the copy is older than the TTL it is still served while
+a single background task reloads it (stale-while-revalidate). Concurrent
+loads are coalesced into one fetch per worker. Each load that changes the
+data bumps a version counter; sessions keep only that version number and
+read the shared snapshot through it.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+from types import MappingProxyType
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+from credit_card_comparison_site.catalog.models import (
+    IssuerInfo,
+    CreditCardInfo,
+    as_card_info,
+)
+from credit_card_comparison_site.catalog.mapped import MappedIndex, MappedTable
+from credit_card_comparison_site.catalog.sources import load_configured_catalog
+from credit_card_comparison_site.catalog.settings import (
+    CATALOG_CACHE_TTL_SECONDS,
+    CATALOG_CLIENT_IDS_ONLY,
+    CATALOG_REFRESH_RETRY_SECONDS,
+)
+from credit_card_comparison_site.catalog.singleflight import SingleFlight
+from credit_card_comparison_site.catalog.search import SubstringIndex
+from credit_card_comparison_site.catalog.numeric import NumericColumns
+from credit_card_comparison_site.catalog.ranking import WelcomeBonusColumns
+
+CatalogLoader = Callable[
+    [], Awaitable[Tuple[Sequence[CreditCardInfo], Sequence[IssuerInfo]]]
+]
+
+
+def _id_index(records: Sequence[Mapping]) -> Mapping[str, Mapping]:
+    """Read-only lookup of records by their "id" field."""
+    if isinstance(records, MappedTable):
+        # Finds row numbers from the mapped id column instead of holding a
+        # record view and an id string per row
+        return MappedIndex(records, "id")
+    # Reversed so the first record wins on duplicate ids, as a scan would
+    return MappingProxyType(
+        {record["id"]: record for record in reversed(records)}
+    )
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """An immutable, versioned copy of the catalog with id lookup indexes."""
+
+    # Tuples, or read-only record views over a memory-mapped catalog file
+    cards: Sequence[CreditCardInfo]
+    issuers: Sequence[IssuerInfo]
+    version: int
+    cards_by_id: Mapping[str, CreditCardInfo] = field(
+        init=False, repr=False, compare=False
+    )
+    issuers_by_id: Mapping[str, IssuerInfo] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        object.__setattr__(self, "cards_by_id", _id_index(self.cards))
+        object.__setattr__(self, "issuers_by_id", _id_index(self.issuers))
+
+    # Indexes and columns are built once per snapshot, by prepare() before
+    # the snapshot is served
+
+    @cached_property
+    def name_index(self) -> SubstringIndex:
+        return SubstringIndex([card["name"] for card in self.cards])
+
+    @cached_property
+    def issuer_index(self) -> SubstringIndex:
+        return SubstringIndex([card["issuer"] for card in self.cards])
+
+    @cached_property
+    def notes_index(self) -> SubstringIndex:
+        # Long free text: scanning it is cheaper than keeping trigrams for it
+        return SubstringIndex(
+            [f"{card['name']} {card['other_notes']}" for card in self.cards],
+            trigrams=False,
+        )
+
+    def search_index(self, field_name: str) -> SubstringIndex:
+        """Index for a filter field: "name", "issuer" or "notes"."""
+        return getattr(self, f"{field_name}_index")
+
+    @cached_property
+    def numeric(self) -> NumericColumns:
+        """Fee and reward columns for range filters and sorting."""
+        return NumericColumns(self.cards)
+
+    @cached_property
+    def welcome_bonuses(self) -> WelcomeBonusColumns:
+        """Parsed welcome bonus amounts for spend ranking."""
+        return WelcomeBonusColumns(self.cards)
+
+    def prepare(self) -> None:
+        """
+        Build the search indexes and numeric columns.
+
+        Blocking; CatalogCache runs it in a thread before serving the
+        snapshot, so event handlers never build them on the event loop.
+        """
+        for field_name in ("name", "issuer", "notes"):
+            self.search_index(field_name)
+        self.numeric
+        self.welcome_bonuses
+        if CATALOG_CLIENT_IDS_ONLY:
+            self.client_fingerprint
+
+    @cached_property
+    def client_cards(self) -> List[CreditCardInfo]:
+        """
+        Every card as a plain dict for the browser, built once per snapshot.
+
+        Shared by all sessions on the worker and must not be modified.
+        """
+        return [as_card_info(card) for card in self.cards]
+
+    @cached_property
+    def client_fingerprint(self) -> str:
+        """
+        Hash of client_cards, naming this catalog in browser-facing URLs.
+
+        Unlike the version number it is the same on every worker holding
+        the same data.
+        """
+        body = json.dumps(
+            self.client_cards, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+        return hashlib.sha256(body).hexdigest()[:32]
+
+
+class CatalogCache:
+    """
+    Holds the current catalog snapshot for this worker process.
+
+    Args:
+        loader: Coroutine function returning (cards, issuers)
+        ttl_seconds: Age after which a snapshot is refreshed in the background
+        retry_seconds: Minimum wait after a failed background refresh
+            before the next one is started
+    """
+
+    # Older versions kept so sessions finish on the data they started with
+    RETAINED_VERSIONS = 2
+
+    def __init__(
+        self,
+        loader: CatalogLoader,
+        ttl_seconds: float,
+        retry_seconds: float = 0.0,
+    ):
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self._refresh_failed_at: Optional[float] = None
+        self._snapshot: Optional[CatalogSnapshot] = None
+        # Monotonic time of the last successful load; kept here rather than on
+        # the snapshot so an unchanged reload can keep the same snapshot
+        self._loaded_at = float("-inf")
+        self._retained: "OrderedDict[int, CatalogSnapshot]" = OrderedDict()
+        self._version = 0
+        self._flight = SingleFlight()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot, 0 before the first load."""
+        return self._version
+
+    def current(self) -> Optional[CatalogSnapshot]:
+        """Return the current snapshot without loading or refreshing it."""
+        return self._snapshot
+
+    def snapshot(self, version: int) -> Optional[CatalogSnapshot]:
+        """
+        Return the snapshot a session loaded, by version.
+
+        Falls back to the current snapshot when that version is no longer
+        retained, and returns None for version 0 (nothing loaded).
+        """
+        if not version:
+            return None
+        snapshot = self._retained.get(version)
+        return snapshot if snapshot is not None else self._snapshot
+
+    def retained(self, version: int) -> Optional[CatalogSnapshot]:
+        """Return the snapshot with exactly this version, if still retained."""
+        return self._retained.get(version)
+
+    def retained_snapshots(self) -> List[CatalogSnapshot]:
+        """The current snapshot and the older ones still retained."""
+        return list(self._retained.values())
+
+    def is_stale(self) -> bool:
+        return (
+            self._snapshot is None
+            or time.monotonic() - self._loaded_at >= self.ttl_seconds
+        )
+
+    async def get(self) -> CatalogSnapshot:
+        """
+        Return the catalog, loading it on first use.
+
+        A stale snapshot is returned immediately and a background refresh
+        is started if one is not already running.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return await self.refresh()
+        if self.is_stale():
+            self._schedule_refresh()
+        return snapshot
+
+    async def refresh(self) -> CatalogSnapshot:
+        """
+        Reload the catalog and return the new snapshot.
+
+        Callers arriving while a reload is running await that reload
+        instead of starting another one.
+        """
+        return await self._flight.do("catalog", self._load)
+
+    async def _load(self) -> CatalogSnapshot:
+        cards, issuers = await self._loader()
+        if isinstance(cards, list):
+            cards = tuple(cards)
+        if isinstance(issuers, list):
+            issuers = tuple(issuers)
+        previous = self._snapshot
+        if (
+            previous is not None
+            and previous.cards == cards
+            and previous.issuers == issuers
+        ):
+            # Unchanged data keeps its snapshot, with its version and the
+            # indexes already built, so dependent caches stay valid
+            self._loaded_at = time.monotonic()
+            return previous
+        snapshot = CatalogSnapshot(cards, issuers, self._version + 1)
+        await asyncio.to_thread(snapshot.prepare)
+        self._version = snapshot.version
+        self._snapshot = snapshot
+        self._loaded_at = time.monotonic()
+        self._retain(snapshot)
+        return snapshot
+
+    def _retain(self, snapshot: CatalogSnapshot) -> None:
+        self._retained[snapshot.version] = snapshot
+        self._retained.move_to_end(snapshot.version)
+        while len(self._retained) > self.RETAINED_VERSIONS:
+            self._retained.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Mark the current snapshot stale so the next read refreshes it."""
+        self._refresh_failed_at = None
+        self._loaded_at = float("-inf")
+
+    def stats(self) -> Dict[str, int]:
+        """Catalog version plus issued and coalesced fetch counters."""
+        return {"version": self._version, **self._flight.stats()}
+
+    def _schedule_refresh(self) -> None:
+        if self._flight.in_flight("catalog") or (
+            self._refresh_task is not None and not self._refresh_task.done()
+        ):
+            return
+        if (
+            self._refresh_failed_at is not None
+            and time.monotonic() - self._refresh_failed_at < self.retry_seconds
+        ):
+            return
+        self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            # Keep serving the stale snapshot; a read after retry_seconds retries
+            self._refresh_failed_at = time.monotonic()
+            print(
+                f"Background catalog refresh failed, retrying in at least "
+                f"{self.retry_seconds:g}s: {e}"
+            )
+        else:
+            self._refresh_failed_at = None
+
+
+catalog_cache = CatalogCache(
+    load_configured_catalog,
+    CATALOG_CACHE_TTL_SECONDS,
+    CATALOG_REFRESH_RETRY_SECONDS,
+)
@@ -0,0 +1,77 @@
+"""
+Long-lived async Supabase client shared by every session on a worker.
+
+The client keeps its HTTP connection pool open between calls, so catalog
+queries reuse existing TCP/TLS connections and never block the event loop.
+"""
+
+import asyncio
+import os
+from typing import Any, Optional
+from supabase import AsyncClient, AsyncClientOptions, acreate_client
+from credit_card_comparison_site.catalog.settings import SUPABASE_TIMEOUT_SECONDS
+
+_client: Optional[AsyncClient] = None
+_client_lock: Optional[asyncio.Lock] = None
+
+
+class SupabaseNotConfiguredError(RuntimeError):
+    """Raised when SUPABASE_URL or SUPABASE_ANON_KEY is not set."""
+
+
+async def get_supabase_client() -> AsyncClient:
+    """
+    Return this worker's Supabase client, creating it on first use.
+
+    Raises:
+        SupabaseNotConfiguredError: If the connection details are not set
+    """
+    global _client, _client_lock
+    if _client is not None:
+        return _client
+
+    if _client_lock is None:
+        _client_lock = asyncio.Lock()
+    async with _client_lock:
+        if _client is None:
+            _client = await create_supabase_client("SUPABASE_ANON_KEY")
+    return _client
+
+
+async def create_supabase_client(key_variable: str) -> AsyncClient:
+    """
+    Create a new async Supabase client.
+
+    Args:
+        key_variable (str): Environment variable holding the API key
+
+    Raises:
+        SupabaseNotConfiguredError: If SUPABASE_URL or the key is not set
+    """
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv(key_variable)
+    if not supabase_url or not supabase_key:
+        raise SupabaseNotConfiguredError(
+            f"Supabase URL or Key not configured. Please set SUPABASE_URL and {key_variable} environment variables."
+        )
+    return await acreate_client(
+        supabase_url,
+        supabase_key,
+        options=AsyncClientOptions(
+            postgrest_client_timeout=SUPABASE_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+async def execute(query: Any, timeout: float = SUPABASE_TIMEOUT_SECONDS) -> Any:
+    """
+    Execute a PostgREST query builder with an overall deadline.
+
+    Args:
+        query: Request builder from client.table(...)
+        timeout (float): Seconds before the call is abandoned
+
+    Raises:
+        asyncio.TimeoutError: If the call does not finish in time
+    """
+    return await asyncio.wait_for(query.execute(), timeout)
@@ -0,0 +1,165 @@
+"""
+Formatted side-by-side comparison rows, cached per worker.
+
+The same card pairs are compared over and over, so each formatted table is
+kept in an LRU keyed by catalog version and the ordered card ids. A hot
+pair then costs one dictionary lookup instead of re-formatting every cell.
+"""
+
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+from credit_card_comparison_site.catalog.models import CreditCardFeatureRow
+from credit_card_comparison_site.catalog.settings import COMPARISON_CACHE_SIZE
+
+# (row label, card field), in display order
+COMPARISON_FEATURES: List[Tuple[str, str]] = [
+    ("Annual Fee", "annual_fee"),
+    ("Welcome Bonus", "welcome_bonus"),
+    ("General Spend Rewards", "rewards_general_spend_pct"),
+    ("Dining Rewards", "rewards_dining_pct"),
+    ("Travel Rewards", "rewards_travel_pct"),
+    ("Gas Rewards", "rewards_gas_pct"),
+    ("Grocery Rewards", "rewards_grocery_pct"),
+    ("Intro APR (Purchases)", "intro_apr_purchase"),
+    ("Intro APR (Balance Transfer)", "intro_apr_balance_transfer"),
+    ("Regular APR", "regular_apr"),
+    ("Issuer", "issuer"),
+    ("Other Notes", "other_notes"),
+]
+
+
+def _format_percentage(value: float) -> str:
+    return f"{value}%" if value > 0 else "N/A"
+
+
+def _format_fee_display(value: int) -> str:
+    return f"${value}" if value > 0 else "No Annual Fee"
+
+
+def _format_text(value: Any) -> str:
+    return str(value) if value is not None else "N/A"
+
+
+# Formatter per field, decided once instead of per cell
+_FORMATTERS: Dict[str, Callable[[Any], str]] = {
+    key: (
+        _format_fee_display
+        if key == "annual_fee"
+        else _format_percentage
+        if "_pct" in key
+        else _format_text
+    )
+    for _, key in COMPARISON_FEATURES
+}
+
+
+def build_comparison_rows(
+    cards: Sequence[Mapping[str, Any]],
+) -> List[CreditCardFeatureRow]:
+    """
+    Format the comparison table for cards, one row per feature.
+
+    Args:
+        cards: Cards in column order
+
+    Returns:
+        list: Feature rows with one formatted value per card
+    """
+    return [
+        CreditCardFeatureRow(
+            feature_label=label,
+            values=[_FORMATTERS[key](card.get(key)) for card in cards],
+        )
+        for label, key in COMPARISON_FEATURES
+    ]
+
+
+# (catalog version, card ids in column order)
+ComparisonKey = Tuple[int, Tuple[str, ...]]
+
+
+class ComparisonCache:
+    """
+    LRU of formatted comparison rows for this worker process.
+
+    Cached rows are shared between sessions and must not be modified.
+
+    Args:
+        max_entries (int): Tables kept before the least recently used is dropped
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._rows: "OrderedDict[ComparisonKey, List[CreditCardFeatureRow]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def rows(
+        self,
+        catalog_version: int,
+        cards: Sequence[Mapping[str, Any]],
+    ) -> List[CreditCardFeatureRow]:
+        """
+        Comparison rows for cards, formatted on the first request only.
+
+        Args:
+            catalog_version (int): Version the cards were read from
+            cards: Cards in column order; the order is part of the key
+
+        Returns:
+            list: Feature rows with one formatted value per card
+        """
+        key = (catalog_version, tuple(card["id"] for card in cards))
+        rows = self._rows.get(key)
+        if rows is not None:
+            self.hits += 1
+            self._rows.move_to_end(key)
+            return rows
+        self.misses += 1
+        rows = build_comparison_rows(cards)
+        self._rows[key] = rows
+        while len(self._rows) > self.max_entries:
+            self._rows.popitem(last=False)
+        return rows
+
+    def clear(self) -> None:
+        self._rows.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._rows),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class PairAccessCounter:
+    """
+    Counts how often each ordered card pair is compared on this worker.
+
+    The counts pick which pairs to prerender as static pages. Once more
+    than max_pairs pairs are tracked, the least compared half is dropped.
+
+    Args:
+        max_pairs (int): Distinct pairs tracked at most
+    """
+
+    def __init__(self, max_pairs: int = 100_000):
+        self.max_pairs = max_pairs
+        self._counts: Counter = Counter()
+
+    def record(self, card_ids: Sequence[str]) -> None:
+        self._counts[tuple(card_ids)] += 1
+        if len(self._counts) > self.max_pairs:
+            self._counts = Counter(
+                dict(self._counts.most_common(self.max_pairs // 2))
+            )
+
+    def most_common(self, n: int) -> List[Tuple[Tuple[str, ...], int]]:
+        return self._counts.most_common(n)
+
+
+comparison_cache = ComparisonCache(COMPARISON_CACHE_SIZE)
+pair_access_counts = PairAccessCounter()
@@ -0,0 +1,138 @@
+"""
+Sync issuer logo URLs in the database with the issuer icon resolver.
+
+Reads the current issuers rows, works out which logo_url values differ from
+what the resolver would assign, and writes only those rows back in one
+batched upsert. Running it again with no changes writes nothing.
+
+    python -m credit_card_comparison_site.catalog.issuer_sync [--dry-run]
+
+Writes need a key allowed to update issuers; SUPABASE_SERVICE_ROLE_KEY is
+used when set, otherwise SUPABASE_ANON_KEY.
+"""
+
+import argparse
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+from credit_card_comparison_site.catalog.client import (
+    create_supabase_client,
+    execute,
+)
+from credit_card_comparison_site.catalog.loader import fetch_pages
+from credit_card_comparison_site.utils.issuer_icons import (
+    SIMPLE_ICONS_CDN,
+    resolve_issuer_icon_slug,
+)
+
+# Stored in place of a logo for issuers without a Simple Icon; the app
+# swaps it for the default bank icon
+CUSTOM_BANK_ICON_MARKER = "CUSTOM_BANK_ICON"
+
+_MISSING_LOGOS = ["/placeholder.svg", "", None]
+
+# Any Simple Icons CDN URL, whatever version it was stored with
+_SIMPLE_ICONS_PREFIX = SIMPLE_ICONS_CDN.split("@")[0]
+
+
+def desired_logo_url(issuer_name: str, logo_url: Optional[str]) -> Optional[str]:
+    """
+    Logo URL an issuer row should have.
+
+    An exact or case-insensitive name match always gets its Simple Icons
+    URL. The resolver's looser partial match is only trusted for rows with
+    no logo or a Simple Icons logo, so custom logos are never replaced on a
+    guess. Issuers with no logo and no match get the custom bank icon marker.
+
+    Args:
+        issuer_name (str): Issuer name from the row
+        logo_url (str): Currently stored logo URL
+
+    Returns:
+        str: The logo URL to store
+    """
+    missing = logo_url in _MISSING_LOGOS
+    replaceable = missing or (logo_url or "").startswith(_SIMPLE_ICONS_PREFIX)
+    icon_slug = resolve_issuer_icon_slug(issuer_name or "", partial=replaceable)
+    if icon_slug is not None:
+        return f"{SIMPLE_ICONS_CDN}/{icon_slug}.svg"
+    if missing:
+        return CUSTOM_BANK_ICON_MARKER
+    return logo_url
+
+
+def diff_issuer_icons(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Rows whose logo_url needs to change.
+
+    Args:
+        rows: Issuer rows with id, name and logo_url
+
+    Returns:
+        list: Upsert payload with id, name and the new logo_url
+    """
+    changes = []
+    for row in rows:
+        target = desired_logo_url(row.get("name"), row.get("logo_url"))
+        if target != row.get("logo_url"):
+            changes.append(
+                {"id": row["id"], "name": row.get("name"), "logo_url": target}
+            )
+    return changes
+
+
+async def sync_issuer_icons(dry_run: bool = False) -> int:
+    """
+    Apply the logo diff to the issuers table.
+
+    Args:
+        dry_run (bool): Only compute the diff, write nothing
+
+    Returns:
+        int: Number of rows changed (or that would change)
+    """
+    key_variable = (
+        "SUPABASE_SERVICE_ROLE_KEY"
+        if os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+        else "SUPABASE_ANON_KEY"
+    )
+    supabase_client = await create_supabase_client(key_variable)
+
+    def issuers_query(count: bool) -> Any:
+        return (
+            supabase_client.table("issuers")
+            .select("id, name, logo_url", count="exact" if count else None)
+            .order("id")
+        )
+
+    pages = await fetch_pages(issuers_query, lambda rows: rows)
+    rows = [row for page in pages for row in page]
+    changes = diff_issuer_icons(rows)
+    if dry_run:
+        previous = {row["id"]: row.get("logo_url") for row in rows}
+        for change in changes:
+            print(
+                f"{change['name']}: {previous[change['id']]!r} -> "
+                f"{change['logo_url']!r}"
+            )
+    elif changes:
+        # name is included so the upsert's insert half satisfies NOT NULL
+        await execute(
+            supabase_client.table("issuers").upsert(changes, on_conflict="id")
+        )
+    return len(changes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Sync issuer logo URLs with the icon resolver."
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="print each row that would change without writing",
+    )
+    args = parser.parse_args()
+    touched = asyncio.run(sync_issuer_icons(dry_run=args.dry_run))
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"{verb} {touched} issuer row(s)")
@@ -0,0 +1,239 @@
+"""
+Loads the issuer and credit card catalog from Supabase and parses it into typed records.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+from credit_card_comparison_site.catalog.models import CardRecord, IssuerInfo
+from credit_card_comparison_site.catalog.client import execute, get_supabase_client
+from credit_card_comparison_site.catalog.settings import (
+    CATALOG_FETCH_PARALLELISM,
+    CATALOG_INCLUDE_ORPHAN_ISSUERS,
+    CATALOG_PAGE_SIZE,
+)
+from credit_card_comparison_site.utils.issuer_icons import (
+    get_default_icon_url,
+    localize_icon_url,
+)
+
+T = TypeVar("T")
+
+# Logo values that should be replaced with the default bank icon
+PLACEHOLDER_LOGOS = ["/placeholder.svg", "", None, "CUSTOM_BANK_ICON"]
+
+# Cards with their issuer embedded through the issuer_id foreign key
+CARDS_WITH_ISSUERS_SELECT = """
+    *,
+    issuers (
+        id,
+        name,
+        logo_url,
+        website_url,
+        description
+    )
+"""
+
+
+def _resolve_logo(logo_url: Any) -> str:
+    # Use the default icon as fallback if logo is placeholder or missing
+    if logo_url in PLACEHOLDER_LOGOS:
+        return get_default_icon_url()
+    # Serve bundled Simple Icons from the local sprite instead of the CDN
+    return localize_icon_url(logo_url)
+
+
+def parse_issuer(item: Dict[str, Any]) -> IssuerInfo:
+    return IssuerInfo(
+        id=str(item.get("id", "")),
+        name=item.get("name", "N/A"),
+        logo_url=_resolve_logo(item.get("logo_url", "/placeholder.svg")),
+        website_url=item.get("website_url", ""),
+        description=item.get("description", ""),
+    )
+
+
+def parse_card(item: Dict[str, Any]) -> CardRecord:
+    # Get issuer information from the joined data
+    issuer_data = item.get("issuers", {})
+    if issuer_data:
+        issuer_name = issuer_data.get("name", "N/A")
+        issuer_logo = issuer_data.get("logo_url", "/placeholder.svg")
+    else:
+        # Fallback to the old issuer field if JOIN didn't work
+        issuer_name = item.get("issuer", "N/A")
+        issuer_logo = item.get("issuer_logo_url", "/placeholder.svg")
+
+    return CardRecord(
+        id=str(item.get("id", "")),
+        name=item.get("name", "N/A"),
+        issuer_logo_url=_resolve_logo(issuer_logo),
+        annual_fee=int(item.get("annual_fee", 0)),
+        rewards_general_spend_pct=float(
+            item.get("rewards_general_spend_pct", 0.0)
+        ),
+        rewards_dining_pct=float(item.get("rewards_dining_pct", 0.0)),
+        rewards_travel_pct=float(item.get("rewards_travel_pct", 0.0)),
+        rewards_gas_pct=float(item.get("rewards_gas_pct", 0.0)),
+        rewards_grocery_pct=float(item.get("rewards_grocery_pct", 0.0)),
+        welcome_bonus=item.get("welcome_bonus", "N/A"),
+        intro_apr_purchase=item.get("intro_apr_purchase", "N/A"),
+        intro_apr_balance_transfer=item.get(
+            "intro_apr_balance_transfer", "N/A"
+        ),
+        regular_apr=item.get("regular_apr", "N/A"),
+        issuer=issuer_name,  # For backward compatibility
+        issuer_id=str(item.get("issuer_id", "")),
+        other_notes=item.get("other_notes", "N/A"),
+    )
+
+
+def issuers_from_cards(rows: List[Dict[str, Any]]) -> Dict[str, IssuerInfo]:
+    """
+    Collect the issuers embedded in card rows, keyed by issuer id.
+
+    Args:
+        rows: Raw credit_cards rows including the joined issuers object
+
+    Returns:
+        dict: Issuer id to parsed issuer, in first-seen order
+    """
+    issuers: Dict[str, IssuerInfo] = {}
+    for item in rows:
+        issuer_data = item.get("issuers")
+        if not issuer_data:
+            continue
+        issuer_id = str(issuer_data.get("id", ""))
+        if issuer_id not in issuers:
+            issuers[issuer_id] = parse_issuer(issuer_data)
+    return issuers
+
+
+async def fetch_pages(
+    make_query: Callable[[bool], Any],
+    handle_page: Callable[[List[Dict[str, Any]]], T],
+    page_size: int = CATALOG_PAGE_SIZE,
+    parallelism: int = CATALOG_FETCH_PARALLELISM,
+) -> List[T]:
+    """
+    Read a whole table with range requests instead of one unbounded select.
+
+    The first page also returns the exact row count; the remaining pages are
+    then requested concurrently, at most `parallelism` at a time. Each page
+    is handed to handle_page as soon as it arrives so raw rows do not pile up.
+
+    Args:
+        make_query: Builds an ordered select; called with True when the
+            exact row count should be requested
+        handle_page: Parses one page of raw rows
+        page_size (int): Rows per request
+        parallelism (int): Maximum concurrent requests
+
+    Returns:
+        list: handle_page results in table order
+    """
+    first = await execute(make_query(True).range(0, page_size - 1))
+    first_rows = first.data or []
+    total = first.count if first.count is not None else len(first_rows)
+    if 0 < len(first_rows) < page_size and total > len(first_rows):
+        # The server caps rows per response below our page size
+        page_size = len(first_rows)
+    starts = range(len(first_rows), total, page_size)
+    results: List[Optional[T]] = [handle_page(first_rows)]
+    results.extend([None] * len(starts))
+    del first, first_rows
+
+    semaphore = asyncio.Semaphore(parallelism)
+
+    async def fetch_page(index: int, start: int) -> None:
+        async with semaphore:
+            response = await execute(
+                make_query(False).range(start, start + page_size - 1)
+            )
+        results[index] = handle_page(response.data or [])
+
+    await asyncio.gather(
+        *(fetch_page(index, start) for index, start in enumerate(starts, 1))
+    )
+    return results
+
+
+async def load_cards_by_id(card_ids: Sequence[str]) -> List[CardRecord]:
+    """
+    Fetch and parse only the given cards, with their issuers embedded.
+
+    Args:
+        card_ids: Card ids to look up
+
+    Returns:
+        list: The cards that exist, in no particular order
+
+    Raises:
+        SupabaseNotConfiguredError: If the connection details are not set
+    """
+    supabase_client = await get_supabase_client()
+    response = await execute(
+        supabase_client.table("credit_cards")
+        .select(CARDS_WITH_ISSUERS_SELECT)
+        .in_("id", list(card_ids))
+    )
+    return [parse_card(item) for item in response.data or []]
+
+
+async def load_catalog() -> Tuple[List[CardRecord], List[IssuerInfo]]:
+    """
+    Fetch and parse all cards and issuers from Supabase.
+
+    Issuers come from the card query's embedded join, so the catalog loads
+    without a separate issuers round trip. With CATALOG_INCLUDE_ORPHAN_ISSUERS
+    the issuers table is read concurrently to add issuers that have no cards.
+    Both tables are read in pages (see fetch_pages).
+
+    Returns:
+        tuple: (cards, issuers)
+
+    Raises:
+        SupabaseNotConfiguredError: If the connection details are not set
+    """
+    supabase_client = await get_supabase_client()
+
+    def cards_query(count: bool) -> Any:
+        return (
+            supabase_client.table("credit_cards")
+            .select(CARDS_WITH_ISSUERS_SELECT, count="exact" if count else None)
+            .order("id")
+        )
+
+    def issuers_query(count: bool) -> Any:
+        return (
+            supabase_client.table("issuers")
+            .select("*", count="exact" if count else None)
+            .order("id")
+        )
+
+    def parse_card_page(
+        rows: List[Dict[str, Any]],
+    ) -> Tuple[List[CardRecord], Dict[str, IssuerInfo]]:
+        return [parse_card(item) for item in rows], issuers_from_cards(rows)
+
+    def parse_issuer_page(rows: List[Dict[str, Any]]) -> List[IssuerInfo]:
+        return [parse_issuer(item) for item in rows]
+
+    issuer_pages: List[List[IssuerInfo]] = []
+    if CATALOG_INCLUDE_ORPHAN_ISSUERS:
+        card_pages, issuer_pages = await asyncio.gather(
+            fetch_pages(cards_query, parse_card_page),
+            fetch_pages(issuers_query, parse_issuer_page),
+        )
+    else:
+        card_pages = await fetch_pages(cards_query, parse_card_page)
+
+    cards: List[CardRecord] = []
+    issuers: Dict[str, IssuerInfo] = {}
+    for page_cards, page_issuers in card_pages:
+        cards.extend(page_cards)
+        for issuer_id, issuer in page_issuers.items():
+            issuers.setdefault(issuer_id, issuer)
+    for page in issuer_pages:
+        for issuer in page:
+            issuers.setdefault(issuer["id"], issuer)
+    return cards, list(issuers.values())
@@ -0,0 +1,52 @@
+"""
+Point lookups of individual cards by id.
+
+Shared compare links only need two cards. When this worker has not loaded
+the catalog yet, those cards are fetched with one filtered query instead
+of downloading the whole catalog first.
+"""
+
+from typing import List, Mapping, Sequence, Tuple
+from credit_card_comparison_site.catalog.cache import catalog_cache
+from credit_card_comparison_site.catalog.singleflight import SingleFlight
+from credit_card_comparison_site.catalog.sources import (
+    SupabaseCatalogSource,
+    get_catalog_source,
+)
+
+_lookups = SingleFlight()
+
+
+async def find_cards(card_ids: Sequence[str]) -> Tuple[int, List[Mapping]]:
+    """
+    Look up cards by id, from the cached catalog when there is one.
+
+    Without a cached catalog, a Supabase source answers with a query for
+    just these ids (concurrent lookups of the same ids share it), and local
+    sources load the catalog, which is only a file read.
+
+    Args:
+        card_ids: Card ids to look up
+
+    Returns:
+        tuple: (catalog version, or 0 when the cards did not come from the
+            cached catalog; the cards found, in the order requested)
+
+    Raises:
+        SupabaseNotConfiguredError: If no catalog source is configured
+    """
+    if catalog_cache.current() is None:
+        source = get_catalog_source()
+        if isinstance(source, SupabaseCatalogSource):
+            key = tuple(card_ids)
+            found = await _lookups.do(key, lambda: source.load_cards(key))
+            by_id = {card["id"]: card for card in found}
+            return 0, [by_id[card_id] for card_id in card_ids if card_id in by_id]
+
+    snapshot = await catalog_cache.get()
+    cards = [
+        snapshot.cards_by_id[card_id]
+        for card_id in card_ids
+        if card_id in snapshot.cards_by_id
+    ]
+    return snapshot.version, cards
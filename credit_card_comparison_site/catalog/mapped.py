@@ -0,0 +1,329 @@
+"""
+Memory-mapped catalog shared by every worker process on a host.
+
+One loader process writes the catalog as a flat columnar binary file:
+numeric columns are packed 8-byte arrays, and each string column is an
+offsets table followed by one UTF-8 blob. Workers map the file read-only
+and read fields through lightweight record views, so the catalog's data
+lives once in the page cache instead of once per worker. A reload is an
+atomic rename of a new file over the old one.
+
+Write the file from the configured catalog source with:
+
+    python -m credit_card_comparison_site.catalog.mapped [path]
+"""
+
+import asyncio
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from credit_card_comparison_site.catalog.models import IssuerInfo, CreditCardInfo
+from credit_card_comparison_site.catalog.settings import CATALOG_MMAP_PATH
+
+MAGIC = b"CCCATMM1"
+_HEADER_LENGTH = struct.Struct("<I")
+_ALIGNMENT = 8
+
+# Column layouts per annotated field type
+_ARRAY_CODES = {int: "q", float: "d"}
+_OFFSETS_CODE = "Q"
+
+
+def _data_start(header_length: int) -> int:
+    # Column regions begin at the first aligned offset after the header
+    prefix_length = len(MAGIC) + _HEADER_LENGTH.size + header_length
+    return prefix_length + (-prefix_length % _ALIGNMENT)
+
+
+def _column_types(record_type: type) -> Dict[str, type]:
+    return dict(record_type.__annotations__)
+
+
+CARD_COLUMNS = _column_types(CreditCardInfo)
+ISSUER_COLUMNS = _column_types(IssuerInfo)
+
+
+def _encode_table(
+    records: Sequence, columns: Dict[str, type]
+) -> List[Tuple[str, str, bytes]]:
+    """Encode a table as (column, region kind, bytes) regions."""
+    regions = []
+    for name, column_type in columns.items():
+        values = [record[name] for record in records]
+        code = _ARRAY_CODES.get(column_type)
+        if code is not None:
+            regions.append(
+                (name, "values", array(code, map(column_type, values)).tobytes())
+            )
+            continue
+        encoded = [str(value).encode("utf-8") for value in values]
+        offsets = array(_OFFSETS_CODE, [0])
+        for item in encoded:
+            offsets.append(offsets[-1] + len(item))
+        regions.append((name, "offsets", offsets.tobytes()))
+        regions.append((name, "data", b"".join(encoded)))
+    return regions
+
+
+def write_mapped_catalog(
+    path: str,
+    cards: Sequence[CreditCardInfo],
+    issuers: Sequence[IssuerInfo],
+) -> None:
+    """
+    Write the catalog file and atomically replace any existing one.
+
+    Workers that already mapped the old file keep reading it until they
+    reload; the rename never exposes a partly written file.
+
+    Args:
+        path (str): Destination file
+        cards: Parsed cards
+        issuers: Parsed issuers
+    """
+    tables = {
+        "cards": (cards, CARD_COLUMNS),
+        "issuers": (issuers, ISSUER_COLUMNS),
+    }
+    header: Dict[str, Any] = {"byteorder": sys.byteorder, "tables": {}}
+    body: List[bytes] = []
+    position = 0
+    for table_name, (records, columns) in tables.items():
+        layout: Dict[str, Dict[str, List[int]]] = {}
+        for column, kind, data in _encode_table(records, columns):
+            padding = -position % _ALIGNMENT
+            body.append(b"\0" * padding)
+            position += padding
+            layout.setdefault(column, {})[kind] = [position, len(data)]
+            body.append(data)
+            position += len(data)
+        header["tables"][table_name] = {"rows": len(records), "columns": layout}
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_start = _data_start(len(header_bytes))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b"\0" * (data_start - f.tell()))
+            for chunk in body:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class MappedRecord(Mapping):
+    """Read-only view of one row; fields are decoded on access."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "MappedTable", row: int):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        return self._table.value(key, self._row)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.columns)
+
+    def __len__(self) -> int:
+        return len(self._table.columns)
+
+    def __repr__(self) -> str:
+        return f"MappedRecord({dict(self)!r})"
+
+
+class MappedTable(Sequence):
+    """Sequence of MappedRecord views over one table of a mapped file."""
+
+    def __init__(
+        self,
+        buffer: memoryview,
+        rows: int,
+        layout: Dict[str, Dict[str, List[int]]],
+        columns: Dict[str, type],
+    ):
+        self._rows = rows
+        self.columns = list(columns)
+        self._numbers: Dict[str, memoryview] = {}
+        self._strings: Dict[str, Tuple[memoryview, memoryview]] = {}
+        for name, column_type in columns.items():
+            regions = layout[name]
+            code = _ARRAY_CODES.get(column_type)
+            if code is not None:
+                start, length = regions["values"]
+                self._numbers[name] = buffer[start:start + length].cast(code)
+            else:
+                start, length = regions["offsets"]
+                offsets = buffer[start:start + length].cast(_OFFSETS_CODE)
+                start, length = regions["data"]
+                self._strings[name] = (offsets, buffer[start:start + length])
+
+    def value(self, column: str, row: int) -> Any:
+        numbers = self._numbers.get(column)
+        if numbers is not None:
+            return numbers[row]
+        if column not in self._strings:
+            raise KeyError(column)
+        offsets, data = self._strings[column]
+        return str(data[offsets[row]:offsets[row + 1]], "utf-8")
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [MappedRecord(self, i) for i in range(*row.indices(self._rows))]
+        if row < 0:
+            row += self._rows
+        if not 0 <= row < self._rows:
+            raise IndexError(row)
+        return MappedRecord(self, row)
+
+
+class MappedIndex(Mapping):
+    """
+    Read-only lookup from one string column's values to record views.
+
+    Rows are kept sorted by that column in a compact array and found by
+    binary search, so the index holds no per-record objects and record
+    views are only created on lookup. The first row wins on duplicate
+    values, as a scan would.
+
+    Args:
+        table (MappedTable): Table to index
+        column (str): String column holding the lookup keys, such as "id"
+    """
+
+    def __init__(self, table: "MappedTable", column: str):
+        self._table = table
+        self._column = column
+        keys = [table.value(column, row) for row in range(len(table))]
+        # Stable, so duplicates stay in row order and the first one is found
+        self._rows = array("q", sorted(range(len(keys)), key=keys.__getitem__))
+        self._length = len(set(keys))
+
+    def _key(self, row: int) -> str:
+        return self._table.value(self._column, row)
+
+    def _find(self, key: str) -> Optional[int]:
+        index = bisect.bisect_left(self._rows, key, key=self._key)
+        if index < len(self._rows) and self._key(self._rows[index]) == key:
+            return self._rows[index]
+        return None
+
+    def __getitem__(self, key: str) -> MappedRecord:
+        row = self._find(key) if isinstance(key, str) else None
+        if row is None:
+            raise KeyError(key)
+        return MappedRecord(self._table, row)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        previous = None
+        for row in self._rows:
+            key = self._key(row)
+            if key != previous:
+                yield key
+            previous = key
+
+    def __len__(self) -> int:
+        return self._length
+
+
+class MappedCatalog:
+    """
+    A catalog file mapped read-only into this process.
+
+    Args:
+        path (str): File written by write_mapped_catalog
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a mapped catalog file")
+        (header_length,) = _HEADER_LENGTH.unpack_from(buffer, len(MAGIC))
+        header_start = len(MAGIC) + _HEADER_LENGTH.size
+        header = json.loads(
+            bytes(buffer[header_start:header_start + header_length])
+        )
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written on a {header['byteorder']}-endian host")
+        data = buffer[_data_start(header_length):]
+        tables = header["tables"]
+        self.cards = MappedTable(
+            data, tables["cards"]["rows"], tables["cards"]["columns"], CARD_COLUMNS
+        )
+        self.issuers = MappedTable(
+            data,
+            tables["issuers"]["rows"],
+            tables["issuers"]["columns"],
+            ISSUER_COLUMNS,
+        )
+
+
+class MappedCatalogSource:
+    """
+    Catalog source backed by a memory-mapped file.
+
+    The file is remapped only after it has been replaced, so refreshes of an
+    unchanged file return the same tables and keep the catalog version.
+
+    Args:
+        path (str): File written by write_mapped_catalog
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._catalog: Optional[MappedCatalog] = None
+
+    async def load(self) -> Tuple[MappedTable, MappedTable]:
+        stat = os.stat(self.path)
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if self._catalog is None or self._catalog.identity != identity:
+            self._catalog = MappedCatalog(self.path)
+        return self._catalog.cards, self._catalog.issuers
+
+
+async def export_mapped_catalog(path: str = CATALOG_MMAP_PATH) -> int:
+    """
+    Load the catalog from Supabase, or the snapshot file, and write it to path.
+
+    Returns:
+        int: Number of cards written
+    """
+    from credit_card_comparison_site.catalog.sources import get_catalog_source
+
+    source = get_catalog_source()
+    if isinstance(source, MappedCatalogSource):
+        raise ValueError("CATALOG_SOURCE=mmap cannot be used to export itself")
+    cards, issuers = await source.load()
+    write_mapped_catalog(path, cards, issuers)
+    return len(cards)
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else CATALOG_MMAP_PATH
+    count = asyncio.run(export_mapped_catalog(target))
+    print(f"Wrote {count} cards to {target}")
@@ -0,0 +1,139 @@
+"""
+Typed shapes for catalog records shared by the loader, the cache and the UI state.
+"""
+
+import sys
+from collections.abc import Mapping as MappingABC
+from typing import Any, Dict, Iterator, Mapping, Tuple, TypedDict, List, Union
+
+
+class IssuerInfo(TypedDict):
+    id: str
+    name: str
+    logo_url: str
+    website_url: str
+    description: str
+
+
+class CreditCardInfo(TypedDict):
+    id: str
+    name: str
+    issuer_logo_url: str
+    annual_fee: int
+    rewards_general_spend_pct: float
+    rewards_dining_pct: float
+    rewards_travel_pct: float
+    rewards_gas_pct: float
+    rewards_grocery_pct: float
+    welcome_bonus: str
+    intro_apr_purchase: str
+    intro_apr_balance_transfer: str
+    regular_apr: str
+    issuer: str  # Keep for backward compatibility
+    issuer_id: str  # New foreign key
+    other_notes: str
+
+
+class RankedCardInfo(TypedDict):
+    id: str
+    name: str
+    issuer: str
+    issuer_logo_url: str
+    annual_fee: int
+    rewards_value: float
+    bonus_value: float
+    net_value: float
+
+
+class CreditCardFeatureRow(TypedDict):
+    feature_label: str
+    values: List[Union[str, int, float, None]]
+
+
+CARD_FIELDS: Tuple[str, ...] = tuple(CreditCardInfo.__annotations__)
+_CARD_FIELD_SET = frozenset(CARD_FIELDS)
+
+# Text fields whose values repeat across many cards (issuer names, logo
+# URLs, APR wording, "N/A" defaults); names and notes are mostly unique
+INTERNED_CARD_FIELDS = frozenset({
+    "issuer_logo_url",
+    "welcome_bonus",
+    "intro_apr_purchase",
+    "intro_apr_balance_transfer",
+    "regular_apr",
+    "issuer",
+    "issuer_id",
+})
+
+# Shared float/int objects for fees and reward rates, which take few values.
+# Keyed by type as well, since 0 == 0.0 would otherwise swap ints and floats
+_NUMBERS: Dict[Tuple[type, Union[int, float]], Union[int, float]] = {}
+
+
+class CardRecord(MappingABC):
+    """
+    Compact, read-only card held by the catalog.
+
+    Fields live in slots instead of a per-card dict, repeated strings are
+    interned and repeated numbers shared, so a large catalog costs a
+    fraction of the memory of CreditCardInfo dicts. It reads like one
+    (card["name"], card.get(...), dict(card)); use as_card_info where a
+    real dict is needed.
+    """
+
+    __slots__ = CARD_FIELDS
+
+    def __init__(self, **fields: Any):
+        for name in CARD_FIELDS:
+            value = fields[name]
+            if name in INTERNED_CARD_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            elif type(value) in (int, float):
+                value = _NUMBERS.setdefault((type(value), value), value)
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("CardRecord is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _CARD_FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(CARD_FIELDS)
+
+    def __len__(self) -> int:
+        return len(CARD_FIELDS)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CardRecord):
+            return all(
+                getattr(self, name) == getattr(other, name) for name in CARD_FIELDS
+            )
+        return MappingABC.__eq__(self, other)
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (_card_record_from_values, (tuple(self.values()),))
+
+    def __repr__(self) -> str:
+        return f"CardRecord({dict(self)!r})"
+
+
+def _card_record_from_values(values: Tuple[Any, ...]) -> CardRecord:
+    return CardRecord(**dict(zip(CARD_FIELDS, values)))
+
+
+def as_card_info(card: Mapping[str, Any]) -> CreditCardInfo:
+    """
+    Return a card as a plain CreditCardInfo dict for the UI.
+
+    The catalog holds cards as CardRecord objects or read-only record
+    views; those are copied into a dict only where they leave for the
+    browser.
+    """
+    if isinstance(card, dict):
+        return card
+    return CreditCardInfo(**card)
@@ -0,0 +1,209 @@
+"""
+Columnar view of the catalog's numeric fields for range filters and sorting.
+
+Each catalog version copies the annual fee and reward rates into one array
+per field, so "no annual fee", "at least 3% dining" and sorting by a
+reward rate are whole-column NumPy operations instead of per-card dict
+lookups. Without NumPy the same API falls back to plain Python.
+"""
+
+import heapq
+from array import array
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+NUMERIC_FIELDS = (
+    "annual_fee",
+    "rewards_general_spend_pct",
+    "rewards_dining_pct",
+    "rewards_travel_pct",
+    "rewards_gas_pct",
+    "rewards_grocery_pct",
+)
+
+REWARD_FIELDS = NUMERIC_FIELDS[1:]
+
+# Inclusive (minimum, maximum) per field; None leaves that side open
+Ranges = Mapping[str, Tuple[Optional[float], Optional[float]]]
+# (field, descending) pairs, most significant first
+SortKeys = Sequence[Tuple[str, bool]]
+
+# Sort orders offered in the UI. Ties fall back to the next key, then to
+# catalog order.
+SORT_ORDERS: Dict[str, List[Tuple[str, bool]]] = {
+    "annual_fee": [("annual_fee", False), ("rewards_general_spend_pct", True)],
+    "rewards_general_spend_pct": [
+        ("rewards_general_spend_pct", True),
+        ("annual_fee", False),
+    ],
+    "rewards_dining_pct": [("rewards_dining_pct", True), ("annual_fee", False)],
+    "rewards_travel_pct": [("rewards_travel_pct", True), ("annual_fee", False)],
+    "rewards_gas_pct": [("rewards_gas_pct", True), ("annual_fee", False)],
+    "rewards_grocery_pct": [
+        ("rewards_grocery_pct", True),
+        ("annual_fee", False),
+    ],
+}
+
+
+class NumericColumns:
+    """
+    The numeric fields of a card sequence, one column per field.
+
+    Positions passed in and returned are indexes into the card sequence
+    the columns were built from.
+
+    Args:
+        cards: Catalog cards, in catalog order
+    """
+
+    def __init__(self, cards: Sequence[Mapping]):
+        self._size = len(cards)
+        if np is not None:
+            self._columns = {
+                name: np.fromiter(
+                    (card[name] for card in cards),
+                    dtype=np.float64,
+                    count=self._size,
+                )
+                for name in NUMERIC_FIELDS
+            }
+        else:
+            self._columns = {
+                name: array("d", (card[name] for card in cards))
+                for name in NUMERIC_FIELDS
+            }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def column(self, name: str):
+        """The values of one field: a float64 array, or array("d") without NumPy."""
+        return self._columns[name]
+
+    def filter(
+        self, ranges: Ranges, within: Optional[Iterable[int]] = None
+    ) -> List[int]:
+        """
+        Positions whose fields all fall inside the given ranges.
+
+        Args:
+            ranges: Inclusive (minimum, maximum) per field
+            within: Optional ascending positions to restrict the filter to
+
+        Returns:
+            list: Matching positions in ascending order
+        """
+        bounds = [
+            (self._columns[name], low, high)
+            for name, (low, high) in ranges.items()
+            if low is not None or high is not None
+        ]
+        if np is None:
+            positions = range(self._size) if within is None else within
+            return [
+                position
+                for position in positions
+                if all(
+                    (low is None or values[position] >= low)
+                    and (high is None or values[position] <= high)
+                    for values, low, high in bounds
+                )
+            ]
+
+        candidates = (
+            None if within is None else np.asarray(within, dtype=np.intp)
+        )
+        if not bounds:
+            return (
+                list(range(self._size))
+                if candidates is None
+                else candidates.tolist()
+            )
+        mask = None
+        for values, low, high in bounds:
+            if candidates is not None:
+                values = values[candidates]
+            if low is not None:
+                mask = values >= low if mask is None else mask & (values >= low)
+            if high is not None:
+                mask = values <= high if mask is None else mask & (values <= high)
+        if candidates is None:
+            return np.flatnonzero(mask).tolist()
+        return candidates[mask].tolist()
+
+    def sort(self, positions: Sequence[int], keys: SortKeys) -> List[int]:
+        """
+        Order positions by several fields.
+
+        Args:
+            positions: Positions to order
+            keys: (field, descending) pairs, most significant first
+
+        Returns:
+            list: The positions in sorted order; ties keep their input order
+        """
+        if not keys:
+            return list(positions)
+        if np is None:
+            return sorted(positions, key=self._key_function(keys))
+        candidates = np.asarray(positions, dtype=np.intp)
+        return candidates[self._lexsort(candidates, keys)].tolist()
+
+    def top_k(
+        self,
+        keys: SortKeys,
+        k: int,
+        within: Optional[Sequence[int]] = None,
+    ) -> List[int]:
+        """
+        The first k positions of sort(within, keys), without sorting them all.
+
+        Args:
+            keys: (field, descending) pairs, most significant first
+            k (int): Number of positions to return
+            within: Positions to rank; all positions when omitted
+
+        Returns:
+            list: Up to k positions in sorted order
+        """
+        if within is None:
+            within = range(self._size)
+        if k <= 0 or not keys:
+            return list(within)[:max(k, 0)]
+        if np is None:
+            return heapq.nsmallest(k, within, key=self._key_function(keys))
+
+        candidates = np.asarray(within, dtype=np.intp)
+        if k < len(candidates):
+            # Keep everything tied with the k-th best primary value so the
+            # secondary keys still decide among them
+            name, descending = keys[0]
+            primary = self._columns[name][candidates]
+            if descending:
+                primary = -primary
+            kth = np.partition(primary, k - 1)[k - 1]
+            candidates = candidates[primary <= kth]
+        return candidates[self._lexsort(candidates, keys)][:k].tolist()
+
+    def _lexsort(self, candidates, keys: SortKeys):
+        # np.lexsort treats its last key as the most significant and is
+        # stable, so equal rows keep their input order
+        columns = []
+        for name, descending in reversed(keys):
+            values = self._columns[name][candidates]
+            columns.append(-values if descending else values)
+        return np.lexsort(columns)
+
+    def _key_function(self, keys: SortKeys):
+        columns = [
+            (self._columns[name], -1.0 if descending else 1.0)
+            for name, descending in keys
+        ]
+        return lambda position: tuple(
+            sign * values[position] for values, sign in columns
+        )
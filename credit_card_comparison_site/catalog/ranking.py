@@ -0,0 +1,165 @@
+"""
+Ranks the whole catalog by net annual value for a spend profile.
+
+Net value is the rewards earned on the given annual spend, minus the annual
+fee, plus the welcome bonus spread over a number of years. Scores for every
+card are computed in one pass over the numeric columns, and only the best
+k are sorted.
+"""
+
+import heapq
+import re
+from typing import Dict, List, Mapping, Sequence, Tuple
+from credit_card_comparison_site.catalog.numeric import NumericColumns, np
+
+# Spend categories and the reward rate field that applies to each
+SPEND_CATEGORIES: Dict[str, str] = {
+    "general": "rewards_general_spend_pct",
+    "dining": "rewards_dining_pct",
+    "travel": "rewards_travel_pct",
+    "gas": "rewards_gas_pct",
+    "grocery": "rewards_grocery_pct",
+}
+
+# An amount (not a dollar figure) followed, within a few words such as a
+# program name, by a point or mile unit
+_POINTS_PATTERN = re.compile(
+    r"(?<![$\d,.])(\d[\d,]*(?:\.\d+)?)\s*(k)?\s+"
+    r"(?:[A-Za-z\u00ae\u2122'-]+\s+){0,3}(?:points|pts|miles)\b",
+    re.IGNORECASE,
+)
+_DOLLARS_PATTERN = re.compile(r"\$\s*(\d[\d,]*(?:\.\d+)?)")
+# Words that make the following dollar amount a spend requirement
+_SPEND_CONTEXT = re.compile(
+    r"\b(?:after|spend|spending|spent)\s*$", re.IGNORECASE
+)
+
+
+def parse_welcome_bonus(text: str) -> Tuple[float, float]:
+    """
+    Split a welcome bonus description into its dollar and point amounts.
+
+    "60,000 points after $4,000 spend" is 60000 points; "80,000 Membership
+    Rewards points after $6,000 spend" is 80000 points; "20,000 ThankYou
+    Points after $1,500" is 20000 points; "$200 after $500 spend" is 200
+    dollars. Dollar amounts after "after" or "spend" are spend
+    requirements, not bonuses; text without an amount is worth nothing.
+
+    Args:
+        text (str): Welcome bonus as stored on the card
+
+    Returns:
+        tuple: (dollars, points)
+    """
+    if not isinstance(text, str):
+        return 0.0, 0.0
+    points = _POINTS_PATTERN.search(text)
+    if points:
+        amount = float(points.group(1).replace(",", ""))
+        return 0.0, amount * 1000 if points.group(2) else amount
+    for dollars in _DOLLARS_PATTERN.finditer(text):
+        if not _SPEND_CONTEXT.search(text, 0, dollars.start()):
+            return float(dollars.group(1).replace(",", "")), 0.0
+    return 0.0, 0.0
+
+
+class WelcomeBonusColumns:
+    """
+    Parsed welcome bonuses of a card sequence, one column per unit.
+
+    Args:
+        cards: Catalog cards, in catalog order
+    """
+
+    def __init__(self, cards: Sequence[Mapping]):
+        parsed: Dict[str, Tuple[float, float]] = {}
+        dollars = []
+        points = []
+        for card in cards:
+            text = card["welcome_bonus"]
+            # Bonus wording repeats across cards, so parse each once
+            if text not in parsed:
+                parsed[text] = parse_welcome_bonus(text)
+            card_dollars, card_points = parsed[text]
+            dollars.append(card_dollars)
+            points.append(card_points)
+        if np is not None:
+            self.dollars = np.array(dollars, dtype=np.float64)
+            self.points = np.array(points, dtype=np.float64)
+        else:
+            self.dollars = dollars
+            self.points = points
+
+
+def rank_cards(
+    numeric: NumericColumns,
+    bonuses: WelcomeBonusColumns,
+    annual_spend: Mapping[str, float],
+    k: int,
+    cents_per_point: float = 1.0,
+    bonus_years: float = 2.0,
+) -> List[Tuple[int, float, float, float]]:
+    """
+    The k cards with the highest net annual value for a spend profile.
+
+    Args:
+        numeric: Fee and reward columns of the catalog
+        bonuses: Welcome bonus columns of the same catalog
+        annual_spend: Dollars spent per year by SPEND_CATEGORIES key
+        k (int): Number of cards to return
+        cents_per_point (float): Value of one point or mile, in cents
+        bonus_years (float): Years the welcome bonus is spread over
+
+    Returns:
+        list: (position, rewards value, bonus value, net value) tuples,
+            best first; equal values keep catalog order
+    """
+    if k <= 0 or not len(numeric):
+        return []
+    years = max(bonus_years, 1.0)
+    spend = [
+        (numeric.column(field), annual_spend.get(category, 0.0) / 100)
+        for category, field in SPEND_CATEGORIES.items()
+        if annual_spend.get(category, 0.0)
+    ]
+    fees = numeric.column("annual_fee")
+
+    if np is None:
+        size = len(numeric)
+        rewards = [
+            sum(rates[position] * amount for rates, amount in spend)
+            for position in range(size)
+        ]
+        bonus = [
+            (bonuses.dollars[position]
+             + bonuses.points[position] * cents_per_point / 100) / years
+            for position in range(size)
+        ]
+        net = [
+            rewards[position] - fees[position] + bonus[position]
+            for position in range(size)
+        ]
+        best = heapq.nlargest(k, range(size), key=net.__getitem__)
+    else:
+        rewards = np.zeros(len(numeric))
+        for rates, amount in spend:
+            rewards += rates * amount
+        bonus = (
+            bonuses.dollars + bonuses.points * (cents_per_point / 100)
+        ) / years
+        net = rewards - fees + bonus
+        if k < len(net):
+            # Partition first so only the candidates for the top k are
+            # sorted; everything tied with the k-th value stays in
+            kth = np.partition(-net, k - 1)[k - 1]
+            candidates = np.flatnonzero(-net <= kth)
+        else:
+            candidates = np.arange(len(net))
+        order = np.argsort(-net[candidates], kind="stable")
+        best = candidates[order][:k].tolist()
+
+    return [
+        (position, float(rewards[position]), float(bonus[position]),
+         float(net[position]))
+        for position in best
+    ]
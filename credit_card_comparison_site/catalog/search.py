@@ -0,0 +1,194 @@
+"""
+Substring search over catalog text fields.
+
+Short fields such as names and issuers get a trigram index per catalog
+version, so a query only checks the cards that share all of its trigrams
+instead of scanning every card on every keystroke. Postings are compact
+sorted integer arrays. Long free-text fields are scanned instead: indexing
+them costs far more time and memory than the scan it saves.
+"""
+
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from credit_card_comparison_site.catalog.settings import (
+    FILTER_CACHE_MAX_POSITIONS,
+)
+
+# Length of the indexed n-grams; shorter queries are checked against the texts
+GRAM_SIZE = 3
+
+_EMPTY = array("I")
+
+
+class SubstringIndex:
+    """
+    Answers `query.lower() in text.lower()` for a fixed list of texts.
+
+    Results are positions into the list the index was built from, in
+    ascending order, and match a linear scan exactly.
+
+    Args:
+        texts: Text of each record, in catalog order
+        trigrams (bool): Build trigram postings; without them every search
+            scans the texts
+    """
+
+    def __init__(self, texts: Sequence[str], trigrams: bool = True):
+        self._texts = [text.lower() for text in texts]
+        self._postings: Dict[str, array] = {}
+        if not trigrams:
+            return
+        for position, text in enumerate(self._texts):
+            grams = {
+                text[start:start + GRAM_SIZE]
+                for start in range(len(text) - GRAM_SIZE + 1)
+            }
+            # Positions are appended in order, so each posting stays sorted
+            for gram in grams:
+                postings = self._postings.get(gram)
+                if postings is None:
+                    postings = self._postings[gram] = array("I")
+                postings.append(position)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _scan(self, query: str, positions: Iterable[int]) -> List[int]:
+        texts = self._texts
+        return [position for position in positions if query in texts[position]]
+
+    def search(
+        self, query: str, within: Optional[Iterable[int]] = None
+    ) -> List[int]:
+        """
+        Positions of texts containing query, case-insensitively.
+
+        Args:
+            query (str): Substring to look for; empty matches everything
+            within: Optional positions to restrict the search to
+
+        Returns:
+            list: Matching positions in ascending order
+        """
+        query = query.lower()
+        if within is not None:
+            within = sorted(within)
+        if not query:
+            return within if within is not None else list(
+                range(len(self._texts))
+            )
+        if not self._postings or len(query) < GRAM_SIZE:
+            return self._scan(
+                query, within if within is not None else range(len(self._texts))
+            )
+
+        posting_lists = sorted(
+            (
+                self._postings.get(query[start:start + GRAM_SIZE], _EMPTY)
+                for start in range(len(query) - GRAM_SIZE + 1)
+            ),
+            key=len,
+        )
+        if within is not None and len(within) <= len(posting_lists[0]):
+            # Checking the given candidates directly is cheaper
+            return self._scan(query, within)
+
+        candidates = set(posting_lists[0])
+        for postings in posting_lists[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(postings)
+        if within is not None:
+            candidates.intersection_update(within)
+        if len(query) == GRAM_SIZE:
+            return sorted(candidates)
+        # Sharing every trigram does not imply containing the whole query
+        return self._scan(query, sorted(candidates))
+
+
+def intersect_positions(left: Sequence[int], right: Sequence[int]) -> List[int]:
+    """Positions present in both ascending sequences, in ascending order."""
+    if len(left) > len(right):
+        left, right = right, left
+    keep = set(left)
+    return [position for position in right if position in keep]
+
+
+# (catalog version, field name, lowercased query)
+FilterKey = Tuple[int, str, str]
+
+
+class FilterMatchCache:
+    """
+    LRU of filter results for this worker process.
+
+    Shared between sessions, so a query typed one character at a time only
+    re-checks the matches of the previous query. Positions are stored as
+    compact integer arrays and the cache is bounded by the total number of
+    positions it holds rather than by the number of queries.
+
+    Args:
+        max_positions (int): Positions kept before the least recently used
+            results are dropped
+    """
+
+    def __init__(self, max_positions: int):
+        self.max_positions = max_positions
+        self._matches: "OrderedDict[FilterKey, array]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, catalog_version: int, field_name: str, query: str
+    ) -> Optional[List[int]]:
+        """
+        Cached positions for query, or None when they are not cached.
+
+        Args:
+            catalog_version (int): Version the positions index into
+            field_name (str): Searched field
+            query (str): Filter text, matched case-insensitively
+
+        Returns:
+            list: Matching positions in ascending order, or None
+        """
+        key = (catalog_version, field_name, query.lower())
+        positions = self._matches.get(key)
+        if positions is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._matches.move_to_end(key)
+        return positions.tolist()
+
+    def put(
+        self,
+        catalog_version: int,
+        field_name: str,
+        query: str,
+        positions: Sequence[int],
+    ) -> None:
+        key = (catalog_version, field_name, query.lower())
+        if len(positions) > self.max_positions:
+            return
+        previous = self._matches.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._matches[key] = array("l", positions)
+        self._size += len(positions)
+        while self._size > self.max_positions:
+            _, dropped = self._matches.popitem(last=False)
+            self._size -= len(dropped)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._matches),
+            "positions": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+filter_match_cache = FilterMatchCache(FILTER_CACHE_MAX_POSITIONS)
@@ -0,0 +1,92 @@
+"""
+Environment-driven settings for catalog loading and caching.
+"""
+
+import os
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        print(f"Invalid value for {name}: {value!r}, using {default}")
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        print(f"Invalid value for {name}: {value!r}, using {default}")
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# How long a loaded catalog is served before a background refresh is started
+CATALOG_CACHE_TTL_SECONDS = _env_float("CATALOG_CACHE_TTL_SECONDS", 300.0)
+
+# Minimum wait after a failed background refresh before the next one is tried
+CATALOG_REFRESH_RETRY_SECONDS = _env_float("CATALOG_REFRESH_RETRY_SECONDS", 30.0)
+
+# Per-request timeout for Supabase calls
+SUPABASE_TIMEOUT_SECONDS = _env_float("SUPABASE_TIMEOUT_SECONDS", 10.0)
+
+# Also query the issuers table so issuers without any cards are listed
+CATALOG_INCLUDE_ORPHAN_ISSUERS = _env_bool(
+    "CATALOG_INCLUDE_ORPHAN_ISSUERS", False
+)
+
+# Rows requested per range request; keep at or below PostgREST's max-rows
+CATALOG_PAGE_SIZE = _env_int("CATALOG_PAGE_SIZE", 1000)
+
+# Maximum number of page requests in flight at once
+CATALOG_FETCH_PARALLELISM = _env_int("CATALOG_FETCH_PARALLELISM", 4)
+
+# Ship the whole catalog to the browser once per catalog version and send
+# only the matching catalog positions on each filter change
+CATALOG_CLIENT_IDS_ONLY = _env_bool("CATALOG_CLIENT_IDS_ONLY", False)
+
+# Where the catalog comes from: "supabase", "snapshot", "mmap", or "auto"
+# (Supabase when configured, otherwise the snapshot file when it exists)
+CATALOG_SOURCE = os.getenv("CATALOG_SOURCE", "auto").strip().lower()
+
+# Local catalog snapshot written by `python -m credit_card_comparison_site.catalog.snapshot`
+CATALOG_SNAPSHOT_PATH = os.getenv(
+    "CATALOG_SNAPSHOT_PATH", "catalog_snapshot.json.gz"
+)
+
+# Memory-mapped catalog written by `python -m credit_card_comparison_site.catalog.mapped`
+CATALOG_MMAP_PATH = os.getenv("CATALOG_MMAP_PATH", "catalog.bin")
+
+# Formatted comparison tables kept per worker, keyed by card pair
+COMPARISON_CACHE_SIZE = _env_int("COMPARISON_CACHE_SIZE", 1024)
+
+# Catalog positions of filter results kept per worker, across all cached queries
+FILTER_CACHE_MAX_POSITIONS = _env_int("FILTER_CACHE_MAX_POSITIONS", 2_000_000)
+
+# Encoded JSON API responses kept per worker, keyed by catalog version and request
+API_RESPONSE_CACHE_SIZE = _env_int("API_RESPONSE_CACHE_SIZE", 2048)
+
+# Cache-Control max-age for JSON API responses; clients revalidate with ETags after it
+API_CACHE_MAX_AGE_SECONDS = _env_int("API_CACHE_MAX_AGE_SECONDS", 60)
+
+# Card pairs to prerender as static compare pages, one "card1_id card2_id" per line
+PRERENDER_PAIRS_PATH = os.getenv("PRERENDER_PAIRS_PATH", "prerender_pairs.txt")
+
+# Number of most compared pairs to prerender when taking pairs from access counts
+PRERENDER_TOP_N = _env_int("PRERENDER_TOP_N", 200)
+
+# Directory the prerendered compare pages are written to and served from by the backend
+PRERENDER_OUTPUT_DIR = os.getenv("PRERENDER_OUTPUT_DIR", "prerendered")
@@ -0,0 +1,67 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one in-flight call instead
+of each starting their own.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time within this event loop.
+
+    Attributes:
+        issued (int): Calls that actually ran
+        coalesced (int): Calls that joined an already running call
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.issued = 0
+        self.coalesced = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Await fn(), or the call already running for key.
+
+        Args:
+            key: Identifies calls that may share a result
+            fn: Coroutine function to run when nothing is in flight
+
+        Returns:
+            The result of the shared call; its exception is raised to every caller
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.issued += 1
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(
+                lambda done: self._forget(key, done)
+            )
+        # Shielded so one cancelled caller does not cancel the shared call
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            future.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "issued": self.issued,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
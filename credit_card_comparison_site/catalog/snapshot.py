@@ -0,0 +1,125 @@
+"""
+Compact local snapshot of the catalog.
+
+The snapshot is gzip-compressed JSON stored column by column, so repeated
+field names are written once per table rather than once per row. Workers
+can start from it without network access, and it doubles as a fixed
+dataset for benchmarks and local testing.
+
+Export the current Supabase catalog with:
+
+    python -m credit_card_comparison_site.catalog.snapshot [path]
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Sequence, Tuple
+from credit_card_comparison_site.catalog.models import (
+    CardRecord,
+    IssuerInfo,
+    CreditCardInfo,
+)
+from credit_card_comparison_site.catalog.settings import CATALOG_SNAPSHOT_PATH
+
+SNAPSHOT_FORMAT = "credit-card-catalog"
+SNAPSHOT_FORMAT_VERSION = 1
+
+CARD_FIELDS = list(CreditCardInfo.__annotations__)
+ISSUER_FIELDS = list(IssuerInfo.__annotations__)
+
+
+def _to_columns(
+    records: Sequence[Dict[str, Any]], fields: List[str]
+) -> Dict[str, List[Any]]:
+    return {name: [record[name] for record in records] for name in fields}
+
+
+def _from_columns(
+    columns: Dict[str, List[Any]], fields: List[str]
+) -> List[Dict[str, Any]]:
+    values = [columns[name] for name in fields]
+    return [dict(zip(fields, row)) for row in zip(*values)]
+
+
+def write_snapshot(
+    path: str,
+    cards: Sequence[CreditCardInfo],
+    issuers: Sequence[IssuerInfo],
+) -> None:
+    """
+    Write the catalog to path, replacing any existing snapshot atomically.
+
+    Args:
+        path (str): Destination file
+        cards: Parsed cards
+        issuers: Parsed issuers
+    """
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_FORMAT_VERSION,
+        "cards": _to_columns(cards, CARD_FIELDS),
+        "issuers": _to_columns(issuers, ISSUER_FIELDS),
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+            fileobj=raw, mode="wb", mtime=0
+        ) as f:
+            f.write(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_snapshot(path: str) -> Tuple[List[CardRecord], List[IssuerInfo]]:
+    """
+    Read a snapshot written by write_snapshot.
+
+    Args:
+        path (str): Snapshot file
+
+    Returns:
+        tuple: (cards, issuers)
+
+    Raises:
+        ValueError: If the file is not a supported snapshot
+    """
+    with gzip.open(path, "rb") as f:
+        payload = json.loads(f.read().decode("utf-8"))
+    if (
+        payload.get("format") != SNAPSHOT_FORMAT
+        or payload.get("version") != SNAPSHOT_FORMAT_VERSION
+    ):
+        raise ValueError(f"{path} is not a supported catalog snapshot")
+    cards = [
+        CardRecord(**card) for card in _from_columns(payload["cards"], CARD_FIELDS)
+    ]
+    issuers = _from_columns(payload["issuers"], ISSUER_FIELDS)
+    return cards, issuers
+
+
+async def export_snapshot(path: str = CATALOG_SNAPSHOT_PATH) -> int:
+    """
+    Load the catalog from Supabase and write it to path.
+
+    Returns:
+        int: Number of cards written
+    """
+    from credit_card_comparison_site.catalog.loader import load_catalog
+
+    cards, issuers = await load_catalog()
+    write_snapshot(path, cards, issuers)
+    return len(cards)
+
+
+if __name__ == "__main__":
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else CATALOG_SNAPSHOT_PATH
+    count = asyncio.run(export_snapshot(target))
+    print(f"Wrote {count} cards to {target}")
@@ -0,0 +1,95 @@
+"""
+Pluggable catalog sources.
+
+The catalog cache loads through whichever source CATALOG_SOURCE selects, so
+the app can run from Supabase, a local snapshot file, or a memory-mapped
+catalog file shared by all workers on the host.
+"""
+
+import asyncio
+import os
+from typing import List, Protocol, Sequence, Tuple
+from credit_card_comparison_site.catalog.models import (
+    CardRecord,
+    IssuerInfo,
+    CreditCardInfo,
+)
+from credit_card_comparison_site.catalog.client import SupabaseNotConfiguredError
+from credit_card_comparison_site.catalog.loader import load_cards_by_id, load_catalog
+from credit_card_comparison_site.catalog.snapshot import read_snapshot
+from credit_card_comparison_site.catalog.mapped import MappedCatalogSource
+from credit_card_comparison_site.catalog.settings import (
+    CATALOG_MMAP_PATH,
+    CATALOG_SNAPSHOT_PATH,
+    CATALOG_SOURCE,
+)
+
+
+class CatalogSource(Protocol):
+    async def load(
+        self,
+    ) -> Tuple[Sequence[CreditCardInfo], Sequence[IssuerInfo]]:
+        ...
+
+
+class SupabaseCatalogSource:
+    """Loads the catalog from Supabase."""
+
+    async def load(self) -> Tuple[List[CreditCardInfo], List[IssuerInfo]]:
+        return await load_catalog()
+
+    async def load_cards(self, card_ids: Sequence[str]) -> List[CardRecord]:
+        """Fetch just the given cards, without loading the catalog."""
+        return await load_cards_by_id(card_ids)
+
+
+class SnapshotCatalogSource:
+    """
+    Loads the catalog from a local snapshot file.
+
+    Args:
+        path (str): Snapshot written by catalog.snapshot
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def load(self) -> Tuple[List[CreditCardInfo], List[IssuerInfo]]:
+        # Decompressing and parsing runs off the event loop
+        return await asyncio.to_thread(read_snapshot, self.path)
+
+
+def get_catalog_source() -> CatalogSource:
+    """
+    Pick the catalog source from CATALOG_SOURCE.
+
+    Raises:
+        SupabaseNotConfiguredError: In auto mode when neither Supabase nor a
+            snapshot file is available
+    """
+    if CATALOG_SOURCE == "snapshot":
+        return SnapshotCatalogSource(CATALOG_SNAPSHOT_PATH)
+    if CATALOG_SOURCE == "supabase":
+        return SupabaseCatalogSource()
+    if CATALOG_SOURCE == "mmap":
+        return _mapped_source
+    if CATALOG_SOURCE != "auto":
+        print(f"Unknown CATALOG_SOURCE {CATALOG_SOURCE!r}, using auto")
+    if os.getenv("SUPABASE_URL") and os.getenv("SUPABASE_ANON_KEY"):
+        return SupabaseCatalogSource()
+    if os.path.exists(CATALOG_SNAPSHOT_PATH):
+        return SnapshotCatalogSource(CATALOG_SNAPSHOT_PATH)
+    raise SupabaseNotConfiguredError(
+        "Supabase URL or Key not configured and no catalog snapshot found. Please set SUPABASE_URL and SUPABASE_ANON_KEY environment variables or CATALOG_SNAPSHOT_PATH."
+    )
+
+
+# One instance per worker so an unchanged file is not remapped on refresh
+_mapped_source = MappedCatalogSource(CATALOG_MMAP_PATH)
+
+
+async def load_configured_catalog() -> Tuple[
+    Sequence[CreditCardInfo], Sequence[IssuerInfo]
+]:
+    """Catalog loader used by the shared catalog cache."""
+    return await get_catalog_source().load()
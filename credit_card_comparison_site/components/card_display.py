@@ -3,6 +3,8 @@ from credit_card_comparison_site.states.credit_card_state import (
     CreditCardState,
     CreditCardInfo,
 )
+from credit_card_comparison_site.catalog.settings import CATALOG_CLIENT_IDS_ONLY
+from credit_card_comparison_site.components.client_catalog import client_catalog_rows
 
 
 def card_option_ui(card: CreditCardInfo) -> rx.Component:
@@ -71,8 +73,10 @@ def card_selection_area() -> rx.Component:
             class_name="text-2xl font-semibold text-gray-700 mb-6 text-center",
         ),
         rx.el.div(
-            rx.foreach(
-                CreditCardState.all_cards, card_option_ui
+            client_catalog_rows(CreditCardState, card_option_ui)
+            if CATALOG_CLIENT_IDS_ONLY
+            else rx.foreach(
+                CreditCardState.visible_cards, card_option_ui
             ),
             class_name="grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 lg:grid-cols-4 xl:grid-cols-5 gap-6",
         ),
@@ -0,0 +1,78 @@
+"""
+The catalog held in the browser when CATALOG_CLIENT_IDS_ONLY is set.
+
+The cards live in client-side React state, filled from /api/catalog/{fingerprint}
+once per catalog, so no session's server-side state ever holds them. Sessions
+only send the positions of the rows to show.
+"""
+
+import json
+import reflex as rx
+from reflex.config import get_config
+from typing import Callable, List
+from credit_card_comparison_site.catalog.models import CreditCardInfo
+
+# {"fingerprint": str, "cards": [CreditCardInfo, ...]} as served by the API
+client_catalog = rx._x.client_state(
+    var_name="client_catalog",
+    default={"fingerprint": "", "cards": []},
+)
+
+
+def fetch_client_catalog(fingerprint: str) -> rx.event.EventSpec:
+    """
+    Load the catalog with this fingerprint into client_catalog.
+
+    The URL names the content, so the browser cache answers repeat loads.
+
+    Args:
+        fingerprint (str): CatalogSnapshot.client_fingerprint of the session's catalog
+
+    Returns:
+        EventSpec: Script event to yield from an event handler
+    """
+    url = f"{get_config().api_url.rstrip('/')}/api/catalog/{fingerprint}"
+    return rx.call_script(
+        f"""(() => {{
+            const setCatalog = {client_catalog.set_value()!s};
+            if (!setCatalog) return;
+            fetch({json.dumps(url)})
+                .then((response) => (response.ok ? response.json() : null))
+                .then((catalog) => catalog && setCatalog(catalog));
+        }})()"""
+    )
+
+
+def client_card(position: rx.Var[int]) -> rx.Var[CreditCardInfo]:
+    """The card at a catalog position in the browser's catalog."""
+    return client_catalog.value["cards"].to(List[CreditCardInfo])[position]
+
+
+def client_catalog_rows(
+    state: type, row: Callable[[rx.Var[CreditCardInfo]], rx.Component]
+) -> rx.Component:
+    """
+    Render state.visible_positions from the browser's catalog.
+
+    Nothing is rendered while the browser still holds another catalog, and
+    a session whose catalog this worker no longer retains is reloaded.
+
+    Args:
+        state: CreditCardState or a substate
+        row: Renders one card
+
+    Returns:
+        rx.Component: The rows
+    """
+    return rx.cond(
+        state.catalog_expired,
+        rx.fragment(on_mount=state.load_initial_cards_from_db),
+        rx.cond(
+            client_catalog.value["fingerprint"] == state.catalog_fingerprint,
+            rx.foreach(
+                state.visible_positions,
+                lambda position: row(client_card(position)),
+            ),
+            rx.fragment(),
+        ),
+    )
@@ -3,9 +3,22 @@ from credit_card_comparison_site.states.credit_card_state import (
     CreditCardState,
     CreditCardInfo,
 )
+from credit_card_comparison_site.catalog.settings import CATALOG_CLIENT_IDS_ONLY
+from credit_card_comparison_site.components.client_catalog import client_catalog_rows
+
+
+# Reward fields offered in the minimum-rewards and sort selects
+REWARD_CATEGORY_LABELS = {
+    "rewards_general_spend_pct": "General",
+    "rewards_dining_pct": "Dining",
+    "rewards_travel_pct": "Travel",
+    "rewards_gas_pct": "Gas",
+    "rewards_grocery_pct": "Grocery",
+}
 
 
 def filter_sidebar_component() -> rx.Component:
+    select_class = "w-full p-2 border border-gray-300 rounded-md shadow-sm text-sm text-gray-700 bg-white"
     return rx.el.div(
         rx.el.h3(
             "Filters",
@@ -39,6 +52,71 @@ def filter_sidebar_component() -> rx.Component:
         #     ),
         #     class_name="mb-4",
         # ),
+        rx.el.div(
+            rx.el.label(
+                "Annual Fee",
+                class_name="block text-sm font-medium text-gray-600 mb-1",
+            ),
+            rx.el.select(
+                rx.el.option("Any", value=""),
+                rx.el.option("No annual fee", value="0"),
+                rx.el.option("Up to $95", value="95"),
+                rx.el.option("Up to $250", value="250"),
+                rx.el.option("Up to $550", value="550"),
+                value=CreditCardState.max_annual_fee,
+                on_change=CreditCardState.set_max_annual_fee,
+                class_name=select_class,
+            ),
+            class_name="mb-4",
+        ),
+        rx.el.div(
+            rx.el.label(
+                "Minimum Rewards",
+                class_name="block text-sm font-medium text-gray-600 mb-1",
+            ),
+            rx.el.div(
+                rx.el.select(
+                    rx.el.option("Any category", value=""),
+                    *[
+                        rx.el.option(label, value=field)
+                        for field, label in REWARD_CATEGORY_LABELS.items()
+                    ],
+                    value=CreditCardState.min_reward_field,
+                    on_change=CreditCardState.set_min_reward_field,
+                    class_name=select_class,
+                ),
+                rx.el.select(
+                    rx.el.option("Any", value=""),
+                    rx.el.option("2%+", value="2"),
+                    rx.el.option("3%+", value="3"),
+                    rx.el.option("4%+", value="4"),
+                    rx.el.option("5%+", value="5"),
+                    value=CreditCardState.min_reward_pct,
+                    on_change=CreditCardState.set_min_reward_pct,
+                    class_name=select_class,
+                ),
+                class_name="flex gap-2",
+            ),
+            class_name="mb-4",
+        ),
+        rx.el.div(
+            rx.el.label(
+                "Sort By",
+                class_name="block text-sm font-medium text-gray-600 mb-1",
+            ),
+            rx.el.select(
+                rx.el.option("Default", value=""),
+                rx.el.option("Lowest annual fee", value="annual_fee"),
+                *[
+                    rx.el.option(f"Best {label.lower()} rewards", value=field)
+                    for field, label in REWARD_CATEGORY_LABELS.items()
+                ],
+                value=CreditCardState.sort_order,
+                on_change=CreditCardState.set_sort_order,
+                class_name=select_class,
+            ),
+            class_name="mb-4",
+        ),
     )
 
 
@@ -107,6 +185,57 @@ def table_row_component(
     )
 
 
+def table_rows() -> rx.Component:
+    if CATALOG_CLIENT_IDS_ONLY:
+        # Rows are looked up in the catalog the browser already holds
+        return client_catalog_rows(CreditCardState, table_row_component)
+    return rx.foreach(
+        CreditCardState.visible_cards,
+        table_row_component,
+    )
+
+
+def pagination_component() -> rx.Component:
+    button_class = "px-3 py-1.5 border border-gray-300 rounded-md text-sm text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed transition-colors"
+    return rx.el.div(
+        rx.el.span(
+            "Showing " + CreditCardState.visible_range_label,
+            class_name="text-sm text-gray-500",
+        ),
+        rx.el.div(
+            rx.el.select(
+                rx.el.option("25 per page", value="25"),
+                rx.el.option("50 per page", value="50"),
+                rx.el.option("100 per page", value="100"),
+                value=CreditCardState.page_size.to_string(),
+                on_change=CreditCardState.set_page_size,
+                class_name="p-1.5 border border-gray-300 rounded-md text-sm text-gray-700 bg-white",
+            ),
+            rx.el.button(
+                "Previous",
+                on_click=CreditCardState.previous_page,
+                disabled=~CreditCardState.has_previous_page,
+                class_name=button_class,
+            ),
+            rx.el.span(
+                "Page "
+                + (CreditCardState.page_index + 1).to_string()
+                + " of "
+                + CreditCardState.page_count.to_string(),
+                class_name="text-sm text-gray-600",
+            ),
+            rx.el.button(
+                "Next",
+                on_click=CreditCardState.next_page,
+                disabled=~CreditCardState.has_next_page,
+                class_name=button_class,
+            ),
+            class_name="flex items-center gap-2",
+        ),
+        class_name="flex justify-between items-center mt-4",
+    )
+
+
 def actual_table_component() -> rx.Component:
     return rx.el.div(
         rx.el.div(
@@ -115,7 +244,7 @@ def actual_table_component() -> rx.Component:
                 class_name="text-xl font-semibold text-gray-700",
             ),
             rx.el.span(
-                CreditCardState.filtered_cards.length().to_string()
+                CreditCardState.filtered_count.to_string()
                 + " cards found",
                 class_name="text-sm text-gray-500",
             ),
@@ -154,16 +283,21 @@ def actual_table_component() -> rx.Component:
                         ),
                     )
                 ),
-                rx.el.tbody(
-                    rx.foreach(
-                        CreditCardState.filtered_cards,
-                        table_row_component,
-                    )
-                ),
+                rx.el.tbody(table_rows()),
                 class_name="w-full",
             ),
-            class_name="overflow-x-auto overflow-y-auto max-h-[calc(100vh-300px)] bg-white rounded-lg border border-gray-200 shadow-md",
+            rx.cond(
+                CreditCardState.has_next_page,
+                rx.el.button(
+                    "Show more",
+                    on_click=CreditCardState.load_more,
+                    class_name="w-full py-2 text-sm font-medium text-indigo-600 hover:bg-indigo-50 border-t border-gray-200 transition-colors",
+                ),
+                rx.fragment(),
+            ),
+            class_name="overflow-x-auto overflow-y-auto max-h-[calc(100vh-340px)] bg-white rounded-lg border border-gray-200 shadow-md",
         ),
+        pagination_component(),
         rx.cond(
             (CreditCardState.selected_card_ids.length() > 0)
             & (
@@ -15,6 +15,19 @@ def navbar() -> rx.Component:
                 ),
                 class_name="flex items-center gap-3",
             ),
+            rx.el.nav(
+                rx.el.a(
+                    "Compare Cards",
+                    href="/",
+                    class_name="text-sm font-medium text-gray-600 hover:text-indigo-600",
+                ),
+                rx.el.a(
+                    "Best Card for You",
+                    href="/best-card",
+                    class_name="text-sm font-medium text-gray-600 hover:text-indigo-600",
+                ),
+                class_name="flex items-center gap-6",
+            ),
             class_name="container px-6 py-4 flex justify-between items-center",
         ),
         class_name="bg-white shadow-md sticky top-0 z-50",
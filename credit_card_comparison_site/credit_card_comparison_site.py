@@ -5,6 +5,8 @@ from credit_card_comparison_site.components.credit_card_table import (
     credit_card_table_view,
 )
 from credit_card_comparison_site.pages.compare_page import comparison_page
+from credit_card_comparison_site.pages.best_card_page import best_card_page
+from credit_card_comparison_site.api import api
 
 
 def index() -> rx.Component:
@@ -20,6 +22,8 @@ def index() -> rx.Component:
 
 app = rx.App(
     theme=rx.theme(appearance="light"),
+    # Cacheable JSON endpoints under /api on the same backend
+    api_transformer=api,
     head_components=[
         rx.el.link(
             rel="preconnect",
@@ -48,8 +52,11 @@ app.add_page(
 app.add_page(
     comparison_page,
     route="/compare/[card1_id]/[card2_id]",
-    on_load=[
-        CreditCardState.load_initial_cards_from_db,
-        CreditCardState.load_cards_for_comparison,
-    ],
-)
\ No newline at end of file
+    # Resolves just the two linked cards; the catalog loads on the list pages
+    on_load=CreditCardState.load_cards_for_comparison,
+)
+app.add_page(
+    best_card_page,
+    route="/best-card",
+    on_load=CreditCardState.load_initial_cards_from_db,
+)
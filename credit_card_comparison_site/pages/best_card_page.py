@@ -0,0 +1,170 @@
+import reflex as rx
+from credit_card_comparison_site.states.best_card_state import BestCardState
+from credit_card_comparison_site.catalog.models import RankedCardInfo
+from credit_card_comparison_site.components.navbar import navbar
+
+SPEND_LABELS = {
+    "general": "Everything else",
+    "dining": "Dining",
+    "travel": "Travel",
+    "gas": "Gas",
+    "grocery": "Groceries",
+}
+
+input_class = "w-full p-2 border border-gray-300 rounded-md shadow-sm focus:ring-indigo-500 focus:border-indigo-500 text-sm"
+label_class = "block text-sm font-medium text-gray-600 mb-1"
+
+
+def spend_input(category: str, label: str) -> rx.Component:
+    return rx.el.div(
+        rx.el.label(label, class_name=label_class),
+        rx.el.input(
+            type="number",
+            min="0",
+            step="50",
+            default_value=BestCardState.monthly_spend[category].to_string(),
+            on_change=lambda value: BestCardState.set_monthly_spend(
+                category, value
+            ),
+            class_name=input_class,
+        ),
+        class_name="mb-4",
+    )
+
+
+def spend_profile_form() -> rx.Component:
+    return rx.el.div(
+        rx.el.h3(
+            "Monthly Spending",
+            class_name="text-xl font-semibold mb-6 text-gray-700",
+        ),
+        *[
+            spend_input(category, label)
+            for category, label in SPEND_LABELS.items()
+        ],
+        rx.el.div(
+            rx.el.label("Point value (cents)", class_name=label_class),
+            rx.el.input(
+                type="number",
+                min="0",
+                step="0.1",
+                default_value=BestCardState.cents_per_point.to_string(),
+                on_change=BestCardState.set_cents_per_point,
+                class_name=input_class,
+            ),
+            class_name="mb-4",
+        ),
+        rx.el.div(
+            rx.el.label("Spread welcome bonus over", class_name=label_class),
+            rx.el.select(
+                rx.el.option("1 year", value="1"),
+                rx.el.option("2 years", value="2"),
+                rx.el.option("3 years", value="3"),
+                rx.el.option("5 years", value="5"),
+                value=BestCardState.bonus_years.to_string(),
+                on_change=BestCardState.set_bonus_years,
+                class_name=input_class,
+            ),
+            class_name="mb-4",
+        ),
+        rx.el.div(
+            rx.el.label("Show", class_name=label_class),
+            rx.el.select(
+                rx.el.option("Top 10", value="10"),
+                rx.el.option("Top 25", value="25"),
+                rx.el.option("Top 50", value="50"),
+                value=BestCardState.top_k.to_string(),
+                on_change=BestCardState.set_top_k,
+                class_name=input_class,
+            ),
+            class_name="mb-4",
+        ),
+    )
+
+
+def ranked_card_row(card: RankedCardInfo, index: rx.Var[int]) -> rx.Component:
+    cell_class = "px-4 py-3 text-sm text-gray-700 whitespace-nowrap"
+    return rx.el.tr(
+        rx.el.td((index + 1).to_string(), class_name=cell_class),
+        rx.el.td(
+            rx.el.div(
+                rx.el.img(
+                    src=card["issuer_logo_url"],
+                    alt=card["issuer"],
+                    class_name="h-6 w-6",
+                ),
+                rx.el.div(
+                    rx.el.span(
+                        card["name"],
+                        class_name="font-medium text-gray-900",
+                    ),
+                    rx.el.span(
+                        card["issuer"],
+                        class_name="block text-xs text-gray-500",
+                    ),
+                ),
+                class_name="flex items-center gap-3",
+            ),
+            class_name=cell_class,
+        ),
+        rx.el.td("$" + card["annual_fee"].to_string(), class_name=cell_class),
+        rx.el.td("$" + card["rewards_value"].to_string(), class_name=cell_class),
+        rx.el.td("$" + card["bonus_value"].to_string(), class_name=cell_class),
+        rx.el.td(
+            "$" + card["net_value"].to_string(),
+            class_name=cell_class + " font-semibold text-indigo-700",
+        ),
+        class_name="border-b border-gray-200 hover:bg-gray-50",
+    )
+
+
+def ranked_cards_table() -> rx.Component:
+    header_class = "px-4 py-3 text-left text-xs font-semibold text-gray-600 uppercase tracking-wider"
+    return rx.el.div(
+        rx.el.h2(
+            "Best Cards for Your Spending",
+            class_name="text-2xl font-semibold text-gray-800 mb-2",
+        ),
+        rx.el.p(
+            "Net value per year: rewards earned minus the annual fee, plus the welcome bonus spread over the chosen period.",
+            class_name="text-sm text-gray-500 mb-6",
+        ),
+        rx.el.div(
+            rx.el.table(
+                rx.el.thead(
+                    rx.el.tr(
+                        rx.el.th("#", class_name=header_class),
+                        rx.el.th("Card", class_name=header_class),
+                        rx.el.th("Annual Fee", class_name=header_class),
+                        rx.el.th("Rewards / yr", class_name=header_class),
+                        rx.el.th("Bonus / yr", class_name=header_class),
+                        rx.el.th("Net Value / yr", class_name=header_class),
+                    ),
+                    class_name="bg-gray-100",
+                ),
+                rx.el.tbody(
+                    rx.foreach(BestCardState.best_cards, ranked_card_row),
+                ),
+                class_name="min-w-full",
+            ),
+            class_name="overflow-x-auto bg-white rounded-lg shadow",
+        ),
+    )
+
+
+def best_card_page() -> rx.Component:
+    return rx.el.main(
+        navbar(),
+        rx.el.div(
+            rx.el.aside(
+                spend_profile_form(),
+                class_name="w-72 p-6 bg-white border-r border-gray-200 shadow-sm shrink-0",
+            ),
+            rx.el.div(
+                ranked_cards_table(),
+                class_name="flex-1 p-6 overflow-auto",
+            ),
+            class_name="flex h-[calc(100vh-68px)] bg-gray-50",
+        ),
+        class_name="font-['Inter'] bg-gray-50 min-h-screen",
+    )
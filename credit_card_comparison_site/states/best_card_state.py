@@ -0,0 +1,94 @@
+import reflex as rx
+from typing import Dict, List
+from credit_card_comparison_site.catalog.models import RankedCardInfo
+from credit_card_comparison_site.catalog.cache import catalog_cache
+from credit_card_comparison_site.catalog.ranking import SPEND_CATEGORIES, rank_cards
+from credit_card_comparison_site.states.credit_card_state import (
+    CreditCardState,
+    _is_finite_number,
+)
+
+
+class BestCardState(CreditCardState):
+    """Ranks the catalog by net annual value for the user's spending."""
+
+    # Monthly spend in dollars per SPEND_CATEGORIES key
+    monthly_spend: Dict[str, int] = {
+        "general": 1000,
+        "dining": 300,
+        "travel": 200,
+        "gas": 150,
+        "grocery": 400,
+    }
+    cents_per_point: float = 1.0
+    bonus_years: int = 2
+    top_k: int = 10
+    MAX_TOP_K: int = 50
+
+    @rx.event
+    def set_monthly_spend(self, category: str, amount: str):
+        amount = amount or "0"
+        if category not in SPEND_CATEGORIES or not _is_finite_number(amount):
+            return
+        value = max(0, int(float(amount)))
+        self.monthly_spend = {**self.monthly_spend, category: value}
+
+    @rx.event
+    def set_cents_per_point(self, value: str):
+        value = value or "0"
+        if _is_finite_number(value):
+            self.cents_per_point = max(0.0, float(value))
+
+    @rx.event
+    def set_bonus_years(self, value: str):
+        try:
+            self.bonus_years = max(1, int(value))
+        except ValueError:
+            pass
+
+    @rx.event
+    def set_top_k(self, value: str):
+        try:
+            self.top_k = min(max(1, int(value)), self.MAX_TOP_K)
+        except ValueError:
+            pass
+
+    @rx.var
+    def best_cards(self) -> List[RankedCardInfo]:
+        """
+        The top_k cards by net annual value.
+
+        Net value is annual rewards on monthly_spend minus the annual fee,
+        plus the welcome bonus spread over bonus_years.
+        """
+        catalog = catalog_cache.snapshot(self.catalog_version)
+        if not catalog:
+            return []
+        annual_spend = {
+            category: amount * 12
+            for category, amount in self.monthly_spend.items()
+        }
+        ranked = rank_cards(
+            catalog.numeric,
+            catalog.welcome_bonuses,
+            annual_spend,
+            self.top_k,
+            cents_per_point=self.cents_per_point,
+            bonus_years=self.bonus_years,
+        )
+        best = []
+        for position, rewards_value, bonus_value, net_value in ranked:
+            card = catalog.cards[position]
+            best.append(
+                RankedCardInfo(
+                    id=card["id"],
+                    name=card["name"],
+                    issuer=card["issuer"],
+                    issuer_logo_url=card["issuer_logo_url"],
+                    annual_fee=int(card["annual_fee"]),
+                    rewards_value=round(rewards_value, 2),
+                    bonus_value=round(bonus_value, 2),
+                    net_value=round(net_value, 2),
+                )
+            )
+        return best
@@ -1,275 +1,396 @@
+import json
+import math
 import reflex as rx
-from typing import TypedDict, List, Union
-import os
-from supabase import create_client, Client
-from credit_card_comparison_site.utils.issuer_icons import get_issuer_icon_url, GENERIC_BANK_ICON, get_default_icon_url
-
-
-class IssuerInfo(TypedDict):
-    id: str
-    name: str
-    logo_url: str
-    website_url: str
-    description: str
-
-
-class CreditCardInfo(TypedDict):
-    id: str
-    name: str
-    issuer_logo_url: str
-    annual_fee: int
-    rewards_general_spend_pct: float
-    rewards_dining_pct: float
-    rewards_travel_pct: float
-    rewards_gas_pct: float
-    rewards_grocery_pct: float
-    welcome_bonus: str
-    intro_apr_purchase: str
-    intro_apr_balance_transfer: str
-    regular_apr: str
-    issuer: str  # Keep for backward compatibility
-    issuer_id: str  # New foreign key
-    other_notes: str
-
-
-class CreditCardFeatureRow(TypedDict):
-    feature_label: str
-    values: List[Union[str, int, float, None]]
+from reflex.config import get_config
+from typing import Dict, List, Optional, Tuple
+from credit_card_comparison_site.catalog.models import (
+    IssuerInfo,
+    CreditCardInfo,
+    CreditCardFeatureRow,
+    as_card_info,
+)
+from credit_card_comparison_site.catalog.client import SupabaseNotConfiguredError
+from credit_card_comparison_site.catalog.cache import CatalogSnapshot, catalog_cache
+from credit_card_comparison_site.catalog.comparison import (
+    build_comparison_rows,
+    comparison_cache,
+    pair_access_counts,
+)
+from credit_card_comparison_site.catalog.lookup import find_cards
+from credit_card_comparison_site.catalog.search import (
+    filter_match_cache,
+    intersect_positions,
+)
+from credit_card_comparison_site.catalog.numeric import REWARD_FIELDS, SORT_ORDERS
+from credit_card_comparison_site.catalog.settings import CATALOG_CLIENT_IDS_ONLY
+from credit_card_comparison_site.components.client_catalog import fetch_client_catalog
+from credit_card_comparison_site.utils.compare_pages import prerendered_compare_url
+
+
+def _is_finite_number(value: str) -> bool:
+    try:
+        return math.isfinite(float(value))
+    except ValueError:
+        return False
 
 
 class CreditCardState(rx.State):
-    all_cards: List[CreditCardInfo] = []
-    all_issuers: List[IssuerInfo] = []
+    # The catalog itself lives once per worker in catalog_cache; each
+    # session only records which version of it the session has loaded
+    catalog_version: int = 0
+    # With CATALOG_CLIENT_IDS_ONLY, the fingerprint of the catalog the
+    # browser fetched; positions sent to it index into that catalog
+    catalog_fingerprint: str = ""
     selected_card_ids: List[str] = []
     MAX_COMPARISON_CARDS: int = 2
     MIN_COMPARISON_CARDS: int = 2
     search_name_query: str = ""
     issuer_filter_query: str = ""
     network_filter_query: str = ""
+    # Numeric filters and sort order, as the values of their selects;
+    # "" means no filter / catalog order
+    max_annual_fee: str = ""
+    min_reward_field: str = ""
+    min_reward_pct: str = ""
+    sort_order: str = ""
+    page_index: int = 0
+    page_size: int = 25
+    window_pages: int = 1
+    MAX_PAGE_SIZE: int = 100
+    MAX_WINDOW_PAGES: int = 4
+    # Cards of a compare link resolved before the catalog was loaded
+    _compare_cards: List[CreditCardInfo] = []
 
     @rx.event(background=True)
     async def load_initial_cards_from_db(self):
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_ANON_KEY")
-        if not supabase_url or not supabase_key:
-            print(
-                "Supabase URL or Key not configured. Please set SUPABASE_URL and SUPABASE_ANON_KEY environment variables."
-            )
+        try:
+            # Served from the shared per-worker cache; only the first load
+            # (or a refresh after the TTL) goes to the catalog source
+            snapshot = await catalog_cache.get()
+        except SupabaseNotConfiguredError as e:
+            print(e)
             yield rx.toast(
                 "Supabase connection details not found. Configure environment variables.",
                 duration=5000,
             )
             async with self:
-                self.all_cards = []
-                self.all_issuers = []
+                self.catalog_version = 0
             return
-        try:
-            supabase_client: Client = create_client(
-                supabase_url, supabase_key
-            )
-            
-            # Load issuers first
-            issuers_response = (
-                supabase_client.table("issuers")
-                .select("*")
-                .execute()
-            )
-            
-            loaded_issuers_data = []
-            if issuers_response.data:
-                for item in issuers_response.data:
-                    logo_url = item.get("logo_url", "/placeholder.svg")
-                    issuer_name = item.get("name", "N/A")
-                    
-                    # Use Simple Icons as fallback if logo is placeholder or missing
-                    if logo_url in ["/placeholder.svg", "", None, "CUSTOM_BANK_ICON"]:
-                        logo_url = get_default_icon_url()
-                    
-                    issuer_info = IssuerInfo(
-                        id=str(item.get("id", "")),
-                        name=issuer_name,
-                        logo_url=logo_url,
-                        website_url=item.get("website_url", ""),
-                        description=item.get("description", ""),
-                    )
-                    loaded_issuers_data.append(issuer_info)
-            
-            # Load credit cards with issuer information using proper JOIN syntax
-            response = (
-                supabase_client.table("credit_cards")
-                .select("""
-                    *,
-                    issuers (
-                        id,
-                        name,
-                        logo_url,
-                        website_url,
-                        description
-                    )
-                """)
-                .execute()
-            )
-            
-            loaded_cards_data = []
-            if response.data:
-                for item in response.data:
-                    # Get issuer information from the joined data
-                    issuer_data = item.get("issuers", {})
-                    if issuer_data:
-                        issuer_name = issuer_data.get("name", "N/A")
-                        issuer_logo = issuer_data.get("logo_url", "/placeholder.svg")
-                        
-                        # Use Simple Icons as fallback if logo is placeholder or missing
-                        if issuer_logo in ["/placeholder.svg", "", None, "CUSTOM_BANK_ICON"]:
-                            issuer_logo = get_default_icon_url()
-                    else:
-                        # Fallback to the old issuer field if JOIN didn't work
-                        issuer_name = item.get("issuer", "N/A")
-                        issuer_logo = item.get("issuer_logo_url", "/placeholder.svg")
-                        
-                        # Use Simple Icons as fallback
-                        if issuer_logo in ["/placeholder.svg", "", None, "CUSTOM_BANK_ICON"]:
-                            issuer_logo = get_default_icon_url()
-                    
-                    card_info = CreditCardInfo(
-                        id=str(item.get("id", "")),
-                        name=item.get("name", "N/A"),
-                        issuer_logo_url=issuer_logo,
-                        annual_fee=int(
-                            item.get("annual_fee", 0)
-                        ),
-                        rewards_general_spend_pct=float(
-                            item.get(
-                                "rewards_general_spend_pct",
-                                0.0,
-                            )
-                        ),
-                        rewards_dining_pct=float(
-                            item.get(
-                                "rewards_dining_pct", 0.0
-                            )
-                        ),
-                        rewards_travel_pct=float(
-                            item.get(
-                                "rewards_travel_pct", 0.0
-                            )
-                        ),
-                        rewards_gas_pct=float(
-                            item.get("rewards_gas_pct", 0.0)
-                        ),
-                        rewards_grocery_pct=float(
-                            item.get(
-                                "rewards_grocery_pct", 0.0
-                            )
-                        ),
-                        welcome_bonus=item.get(
-                            "welcome_bonus", "N/A"
-                        ),
-                        intro_apr_purchase=item.get(
-                            "intro_apr_purchase", "N/A"
-                        ),
-                        intro_apr_balance_transfer=item.get(
-                            "intro_apr_balance_transfer",
-                            "N/A",
-                        ),
-                        regular_apr=item.get(
-                            "regular_apr", "N/A"
-                        ),
-                        issuer=issuer_name,  # For backward compatibility
-                        issuer_id=str(item.get("issuer_id", "")),
-                        other_notes=item.get(
-                            "other_notes", "N/A"
-                        ),
-                    )
-                    loaded_cards_data.append(card_info)
-            
-            async with self:
-                self.all_cards = loaded_cards_data
-                self.all_issuers = loaded_issuers_data
-                
-            if not loaded_cards_data:
-                print(
-                    "No cards loaded from Supabase, or table is empty."
-                )
-                yield rx.toast(
-                    "No credit card data found in the database.",
-                    duration=3000,
-                )
         except Exception as e:
-            print(f"Error fetching data from Supabase: {e}")
+            print(f"Error loading the card catalog: {e}")
             yield rx.toast(
                 "Error connecting to the database. Check logs.",
                 duration=5000,
             )
             async with self:
-                self.all_cards = []
-                self.all_issuers = []
+                self.catalog_version = 0
+            return
+
+        async with self:
+            self._use_catalog_version(snapshot.version)
+
+        if CATALOG_CLIENT_IDS_ONLY:
+            yield fetch_client_catalog(snapshot.client_fingerprint)
+
+        if not snapshot.cards:
+            print(
+                "No cards loaded from the catalog source, or it is empty."
+            )
+            yield rx.toast(
+                "No credit card data found in the database.",
+                duration=3000,
+            )
+
+    def _use_catalog_version(self, version: int):
+        if self.catalog_version != version:
+            self._reset_window()
+        self.catalog_version = version
+        snapshot = (
+            catalog_cache.retained(version) if CATALOG_CLIENT_IDS_ONLY else None
+        )
+        self.catalog_fingerprint = (
+            snapshot.client_fingerprint if snapshot is not None else ""
+        )
 
     @rx.event
     def set_search_name_query(self, query: str):
+        previous = self.search_name_query
         self.search_name_query = query
+        self._refine_filter("name", query, previous)
+        self._reset_window()
 
     @rx.event
     def set_issuer_filter_query(self, query: str):
+        previous = self.issuer_filter_query
         self.issuer_filter_query = query
+        self._refine_filter("issuer", query, previous)
+        self._reset_window()
 
     @rx.event
     def set_network_filter_query(self, query: str):
+        previous = self.network_filter_query
         self.network_filter_query = query
+        self._refine_filter("notes", query, previous)
+        self._reset_window()
+
+    @rx.event
+    def set_max_annual_fee(self, value: str):
+        # Invalid values are ignored so the filter computations never see them
+        if value and not _is_finite_number(value):
+            return
+        self.max_annual_fee = value
+        self._reset_window()
+
+    @rx.event
+    def set_min_reward_field(self, value: str):
+        self.min_reward_field = value if value in REWARD_FIELDS else ""
+        self._reset_window()
+
+    @rx.event
+    def set_min_reward_pct(self, value: str):
+        if value and not _is_finite_number(value):
+            return
+        self.min_reward_pct = value
+        self._reset_window()
+
+    @rx.event
+    def set_sort_order(self, value: str):
+        self.sort_order = value if value in SORT_ORDERS else ""
+        self._reset_window()
 
     @rx.event
     def clear_all_filters(self):
         self.search_name_query = ""
         self.issuer_filter_query = ""
         self.network_filter_query = ""
+        self.max_annual_fee = ""
+        self.min_reward_field = ""
+        self.min_reward_pct = ""
+        self.sort_order = ""
+        self._reset_window()
+
+    def _refine_filter(self, field_name: str, query: str, previous: str):
+        """
+        Cache the matches for one filter field in the worker's LRU.
+
+        While the user keeps typing, the new query contains the previous one,
+        so only the previous matches need to be checked again.
+        """
+        catalog = catalog_cache.snapshot(self.catalog_version)
+        if not query or not catalog:
+            return
+        if filter_match_cache.get(catalog.version, field_name, query) is not None:
+            return
+        within = None
+        if previous and previous.lower() in query.lower():
+            within = filter_match_cache.get(catalog.version, field_name, previous)
+        filter_match_cache.put(
+            catalog.version,
+            field_name,
+            query,
+            catalog.search_index(field_name).search(query, within=within),
+        )
+
+    def _filter_positions(self, field_name: str, query: str) -> List[int]:
+        catalog = catalog_cache.snapshot(self.catalog_version)
+        positions = filter_match_cache.get(catalog.version, field_name, query)
+        if positions is None:
+            positions = catalog.search_index(field_name).search(query)
+            filter_match_cache.put(catalog.version, field_name, query, positions)
+        return positions
+
+    def _numeric_ranges(
+        self,
+    ) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+        ranges = {}
+        if self.max_annual_fee:
+            ranges["annual_fee"] = (None, float(self.max_annual_fee))
+        if self.min_reward_field and self.min_reward_pct:
+            ranges[self.min_reward_field] = (float(self.min_reward_pct), None)
+        return ranges
+
+    def _filtered_positions(self) -> List[int]:
+        """
+        Catalog positions of the cards matching every active filter.
+
+        Text filters narrow the candidates first; fee and reward ranges are
+        then applied column-wise. Positions stay in catalog order.
+        """
+        catalog = catalog_cache.snapshot(self.catalog_version)
+        if not catalog:
+            return []
+        positions = None
+        for field_name, query in (
+            ("name", self.search_name_query),
+            ("issuer", self.issuer_filter_query),
+            ("notes", self.network_filter_query),
+        ):
+            if query:
+                matches = self._filter_positions(field_name, query)
+                positions = (
+                    matches
+                    if positions is None
+                    else intersect_positions(positions, matches)
+                )
+        ranges = self._numeric_ranges()
+        if ranges:
+            positions = catalog.numeric.filter(ranges, within=positions)
+        if positions is None:
+            return list(range(len(catalog.cards)))
+        return positions
 
     @rx.var
-    def filtered_cards(self) -> List[CreditCardInfo]:
-        cards_to_filter = self.all_cards
-        if self.search_name_query:
-            query = self.search_name_query.lower()
-            cards_to_filter = [
-                card
-                for card in cards_to_filter
-                if query in card["name"].lower()
-            ]
-        if self.issuer_filter_query:
-            query = self.issuer_filter_query.lower()
-            cards_to_filter = [
-                card
-                for card in cards_to_filter
-                if query in card["issuer"].lower()
-            ]
-        if self.network_filter_query:
-            query = self.network_filter_query.lower()
-            cards_result = []
-            for card in cards_to_filter:
-                text_to_search = f"{card['name']} {card['other_notes']}".lower()
-                if query in text_to_search:
-                    cards_result.append(card)
-            cards_to_filter = cards_result
-        return cards_to_filter
+    def filtered_count(self) -> int:
+        return len(self._filtered_positions())
+
+    @rx.var
+    def page_count(self) -> int:
+        return max(1, -(-self.filtered_count // self.page_size))
+
+    def _window_positions(self) -> List[int]:
+        start = self.page_index * self.page_size
+        end = start + self.window_pages * self.page_size
+        positions = self._filtered_positions()
+        sort_keys = SORT_ORDERS.get(self.sort_order)
+        if sort_keys and positions:
+            # Only the rows up to the end of the window need ordering
+            catalog = catalog_cache.snapshot(self.catalog_version)
+            ranked = catalog.numeric.top_k(sort_keys, end, within=positions)
+            return ranked[start:end]
+        return positions[start:end]
+
+    @rx.var
+    def visible_cards(self) -> List[CreditCardInfo]:
+        """
+        Only the rows in the current window are sent to the browser.
+
+        The window starts at page_index and spans window_pages pages, so the
+        payload stays bounded however many cards match.
+        """
+        catalog = catalog_cache.snapshot(self.catalog_version)
+        if not catalog or CATALOG_CLIENT_IDS_ONLY:
+            return []
+        return [
+            as_card_info(catalog.cards[position])
+            for position in self._window_positions()
+        ]
+
+    def _client_catalog_snapshot(self) -> Optional[CatalogSnapshot]:
+        # The exact catalog the browser holds, or None once this worker no
+        # longer retains it (or never loaded it)
+        snapshot = catalog_cache.retained(self.catalog_version)
+        if (
+            snapshot is None
+            or snapshot.client_fingerprint != self.catalog_fingerprint
+        ):
+            return None
+        return snapshot
+
+    @rx.var
+    def visible_positions(self) -> List[int]:
+        """
+        Window rows as positions into the browser's catalog (ids-only mode).
+
+        The catalog itself is fetched from /api/catalog/{fingerprint} and is
+        never part of the session state.
+        """
+        if not CATALOG_CLIENT_IDS_ONLY or self._client_catalog_snapshot() is None:
+            return []
+        return self._window_positions()
+
+    @rx.var(cache=False)
+    def catalog_expired(self) -> bool:
+        """True once the browser's catalog can no longer be served positions."""
+        return (
+            CATALOG_CLIENT_IDS_ONLY
+            and bool(self.catalog_version)
+            and self._client_catalog_snapshot() is None
+        )
+
+    @rx.var
+    def visible_range_label(self) -> str:
+        if self.filtered_count == 0:
+            return "0 of 0"
+        start = self.page_index * self.page_size
+        end = min(
+            start + self.window_pages * self.page_size,
+            self.filtered_count,
+        )
+        return f"{start + 1}-{end} of {self.filtered_count}"
+
+    @rx.var
+    def has_previous_page(self) -> bool:
+        return self.page_index > 0
+
+    @rx.var
+    def has_next_page(self) -> bool:
+        return (
+            self.page_index + self.window_pages
+        ) * self.page_size < self.filtered_count
+
+    def _reset_window(self):
+        self.page_index = 0
+        self.window_pages = 1
+
+    @rx.event
+    def next_page(self):
+        if self.has_next_page:
+            self.page_index += self.window_pages
+            self.window_pages = 1
+
+    @rx.event
+    def previous_page(self):
+        self.page_index = max(0, self.page_index - 1)
+        self.window_pages = 1
+
+    @rx.event
+    def go_to_page(self, page_index: int):
+        self.page_index = min(max(0, page_index), self.page_count - 1)
+        self.window_pages = 1
+
+    @rx.event
+    def set_page_size(self, page_size: str):
+        first_visible = self.page_index * self.page_size
+        self.page_size = min(
+            max(1, int(page_size)), self.MAX_PAGE_SIZE
+        )
+        self.page_index = first_visible // self.page_size
+        self.window_pages = 1
+
+    @rx.event
+    def load_more(self):
+        """
+        Extend the scroll window by one page.
+
+        Once the window holds MAX_WINDOW_PAGES pages it slides forward
+        instead of growing, dropping the oldest page.
+        """
+        if not self.has_next_page:
+            return
+        if self.window_pages < self.MAX_WINDOW_PAGES:
+            self.window_pages += 1
+        else:
+            self.page_index += 1
 
     @rx.var
     def unique_issuers(self) -> List[str]:
         """Get list of unique issuer names for filter dropdown"""
-        return sorted(list(set(issuer["name"] for issuer in self.all_issuers)))
+        catalog = catalog_cache.snapshot(self.catalog_version)
+        if not catalog:
+            return []
+        return sorted(list(set(issuer["name"] for issuer in catalog.issuers)))
 
     def _get_card_by_id(
         self, card_id: str
     ) -> CreditCardInfo | None:
-        for card in self.all_cards:
-            if card["id"] == card_id:
-                return card
-        return None
+        catalog = catalog_cache.snapshot(self.catalog_version)
+        return catalog.cards_by_id.get(card_id) if catalog else None
 
     def _get_issuer_by_id(
         self, issuer_id: str
     ) -> IssuerInfo | None:
-        for issuer in self.all_issuers:
-            if issuer["id"] == issuer_id:
-                return issuer
-        return None
+        catalog = catalog_cache.snapshot(self.catalog_version)
+        return catalog.issuers_by_id.get(issuer_id) if catalog else None
 
     @rx.event
     def toggle_selection(self, card_id: str):
@@ -286,14 +407,25 @@ class CreditCardState(rx.State):
             ):
                 card_id_1 = self.selected_card_ids[0]
                 card_id_2 = self.selected_card_ids[1]
-                if (
-                    self._get_card_by_id(card_id_1)
-                    and self._get_card_by_id(card_id_2)
-                    and (card_id_1 != card_id_2)
-                ):
-                    yield rx.redirect(
-                        f"/compare/{card_id_1}/{card_id_2}"
-                    )
+                card_1 = self._get_card_by_id(card_id_1)
+                card_2 = self._get_card_by_id(card_id_2)
+                if card_1 and card_2 and (card_id_1 != card_id_2):
+                    # Popular pairs have a prerendered page on the backend
+                    static_path = prerendered_compare_url([card_1, card_2])
+                    if static_path:
+                        pair_access_counts.record([card_id_1, card_id_2])
+                        # A full page load; the client router only knows
+                        # the frontend's own pages
+                        static_url = (
+                            get_config().api_url.rstrip("/") + static_path
+                        )
+                        yield rx.call_script(
+                            f"window.location.assign({json.dumps(static_url)})"
+                        )
+                    else:
+                        yield rx.redirect(
+                            f"/compare/{card_id_1}/{card_id_2}"
+                        )
                 else:
                     self.selected_card_ids = [
                         id_
@@ -317,12 +449,16 @@ class CreditCardState(rx.State):
     @rx.var
     def cards_to_compare(self) -> List[CreditCardInfo]:
         valid_selected_cards = []
-        if not self.all_cards:
-            return []
+        if not self.catalog_version:
+            return [
+                card
+                for card in self._compare_cards
+                if card["id"] in self.selected_card_ids
+            ]
         for card_id in self.selected_card_ids:
             card = self._get_card_by_id(card_id)
             if card:
-                valid_selected_cards.append(card)
+                valid_selected_cards.append(as_card_info(card))
         return valid_selected_cards
 
     @rx.var
@@ -332,69 +468,30 @@ class CreditCardState(rx.State):
             >= self.MAX_COMPARISON_CARDS
         )
 
-    def _format_percentage(self, value: float) -> str:
-        return f"{value}%" if value > 0 else "N/A"
-
-    def _format_fee_display(self, value: int) -> str:
-        return f"${value}" if value > 0 else "No Annual Fee"
-
     @rx.var
     def comparison_data_rows(
         self,
     ) -> List[CreditCardFeatureRow]:
-        if (
-            not self.cards_to_compare
-            or len(self.cards_to_compare) == 0
-        ):
-            return []
-        features_map: List[tuple[str, str]] = [
-            ("Annual Fee", "annual_fee"),
-            ("Welcome Bonus", "welcome_bonus"),
-            (
-                "General Spend Rewards",
-                "rewards_general_spend_pct",
-            ),
-            ("Dining Rewards", "rewards_dining_pct"),
-            ("Travel Rewards", "rewards_travel_pct"),
-            ("Gas Rewards", "rewards_gas_pct"),
-            ("Grocery Rewards", "rewards_grocery_pct"),
-            ("Intro APR (Purchases)", "intro_apr_purchase"),
-            (
-                "Intro APR (Balance Transfer)",
-                "intro_apr_balance_transfer",
-            ),
-            ("Regular APR", "regular_apr"),
-            ("Issuer", "issuer"),
-            ("Other Notes", "other_notes"),
+        """
+        Formatted rows for the selected cards.
+
+        Served from the per-worker comparison cache, so a pair compared
+        before is a dictionary lookup.
+        """
+        if not self.catalog_version:
+            # Cards from a point lookup carry no catalog version to key on
+            return build_comparison_rows(self.cards_to_compare)
+        # Read once, and key the cache on the version actually read: it is
+        # the current one when the session's version is no longer retained
+        catalog = catalog_cache.snapshot(self.catalog_version)
+        cards = [
+            catalog.cards_by_id[card_id]
+            for card_id in self.selected_card_ids
+            if card_id in catalog.cards_by_id
         ]
-        output_rows: List[CreditCardFeatureRow] = []
-        for label, key in features_map:
-            values_for_row: List[
-                Union[str, int, float, None]
-            ] = []
-            for card in self.cards_to_compare:
-                raw_value = card.get(key)
-                if key == "annual_fee":
-                    values_for_row.append(
-                        self._format_fee_display(raw_value)
-                    )
-                elif "_pct" in key:
-                    values_for_row.append(
-                        self._format_percentage(raw_value)
-                    )
-                else:
-                    values_for_row.append(
-                        str(raw_value)
-                        if raw_value is not None
-                        else "N/A"
-                    )
-            output_rows.append(
-                {
-                    "feature_label": label,
-                    "values": values_for_row,
-                }
-            )
-        return output_rows
+        if not cards:
+            return []
+        return comparison_cache.rows(catalog.version, cards)
 
     @rx.var
     def param_card1_id(self) -> str:
@@ -404,22 +501,53 @@ class CreditCardState(rx.State):
     def param_card2_id(self) -> str:
         return self.router.page.params.get("card2_id", "")
 
-    @rx.event
-    def load_cards_for_comparison(self):
-        card_id1_from_url = self.param_card1_id
-        card_id2_from_url = self.param_card2_id
-        current_selection: List[str] = []
-        card1_obj = self._get_card_by_id(card_id1_from_url)
-        if card1_obj:
-            current_selection.append(card1_obj["id"])
-        card2_obj = self._get_card_by_id(card_id2_from_url)
-        if (
-            card2_obj
-            and card2_obj["id"] != card_id1_from_url
-        ):
-            current_selection.append(card2_obj["id"])
-        self.selected_card_ids = current_selection
+    @rx.event(background=True)
+    async def load_cards_for_comparison(self):
+        """
+        Resolve the two cards named in the compare URL.
+
+        Uses this worker's cached catalog when it has one; otherwise only
+        the two cards are fetched, so a shared link renders without waiting
+        for the whole catalog. Pages that list cards load the catalog when
+        the user navigates on.
+        """
+        async with self:
+            card_id1_from_url = self.param_card1_id
+            card_id2_from_url = self.param_card2_id
+        card_ids = [card_id1_from_url]
+        if card_id2_from_url != card_id1_from_url:
+            card_ids.append(card_id2_from_url)
+        try:
+            version, cards = await find_cards(card_ids)
+        except SupabaseNotConfiguredError as e:
+            print(e)
+            yield rx.toast(
+                "Supabase connection details not found. Configure environment variables.",
+                duration=5000,
+            )
+            return
+        except Exception as e:
+            print(f"Error loading cards for comparison: {e}")
+            yield rx.toast(
+                "Error connecting to the database. Check logs.",
+                duration=5000,
+            )
+            return
+
+        async with self:
+            if version:
+                self._use_catalog_version(version)
+                self._compare_cards = []
+            else:
+                # A version kept from an earlier visit may refer to a catalog
+                # this worker never loaded; the looked-up cards are the data
+                self._use_catalog_version(0)
+                self._compare_cards = [as_card_info(card) for card in cards]
+            self.selected_card_ids = [card["id"] for card in cards]
+        if len(cards) == 2:
+            pair_access_counts.record([card["id"] for card in cards])
 
     @rx.event
     def clear_selected_cards(self):
-        self.selected_card_ids = []
\ No newline at end of file
+        self.selected_card_ids = []
+        self._compare_cards = []
\ No newline at end of file
@@ -2,10 +2,16 @@
 Utility modules for the credit card comparison site.
 """
 
-from .issuer_icons import get_issuer_icon_url, get_issuer_color, GENERIC_BANK_ICON
+from .issuer_icons import (
+    get_issuer_icon_url,
+    resolve_issuer_icon_slug,
+    get_issuer_color,
+    GENERIC_BANK_ICON,
+)
 
 __all__ = [
     'get_issuer_icon_url',
+    'resolve_issuer_icon_slug',
     'get_issuer_color', 
     'GENERIC_BANK_ICON'
 ] 
\ No newline at end of file
@@ -0,0 +1,338 @@
+"""
+Build step that prerenders static compare pages for popular card pairs.
+
+Each pair gets a self-contained HTML page and the same data as JSON under
+PRERENDER_OUTPUT_DIR/compare/, plus a manifest. The backend serves them
+from disk at /prerendered/compare/, so a new export is live without a
+frontend rebuild. Selecting a prerendered pair loads its static page
+without a websocket round trip; every other pair keeps using the dynamic
+/compare route.
+
+Pairs come from --pairs (default PRERENDER_PAIRS_PATH, one
+"card1_id card2_id" per line) or, with --counts-url, from a running
+worker's /api/stats/popular-pairs. Re-run after the catalog changes:
+
+    python -m credit_card_comparison_site.utils.compare_pages [--top N]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import html
+import json
+import os
+import shutil
+import tempfile
+import time
+import urllib.request
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from credit_card_comparison_site.catalog.models import as_card_info
+from credit_card_comparison_site.catalog.comparison import build_comparison_rows
+from credit_card_comparison_site.catalog.settings import (
+    PRERENDER_OUTPUT_DIR,
+    PRERENDER_PAIRS_PATH,
+    PRERENDER_TOP_N,
+)
+
+# Backend route prefix the pages are served under (see api.py)
+PRERENDERED_PATH = "/prerendered/compare"
+PRERENDERED_DIR = os.path.join(PRERENDER_OUTPUT_DIR, "compare")
+MANIFEST_FILE = "manifest.json"
+
+Pair = Tuple[str, str]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} | Credit Card Comparator</title>
+<link rel="canonical" href="{site_url}{dynamic_url}">
+<style>
+body {{ margin: 0; font-family: Inter, system-ui, sans-serif; background: #f9fafb; color: #374151; }}
+header {{ background: #fff; box-shadow: 0 2px 4px rgba(0,0,0,.08); padding: 16px 24px; }}
+header a {{ color: #1f2937; font-size: 24px; font-weight: 700; text-decoration: none; }}
+main {{ max-width: 1100px; margin: 0 auto; padding: 0 16px 48px; }}
+h2 {{ text-align: center; font-size: 30px; color: #1f2937; padding: 24px 0; margin: 0 0 8px; }}
+h2 span {{ color: #4f46e5; }}
+table {{ width: 100%; border-collapse: collapse; background: #fff; }}
+th, td {{ border: 1px solid #d1d5db; padding: 12px; text-align: center; }}
+th {{ background: #f3f4f6; }}
+td:first-child {{ background: #f9fafb; font-weight: 500; color: #4b5563; text-align: left; }}
+th img {{ display: block; height: 32px; margin: 0 auto 4px; }}
+th span {{ color: #4338ca; font-weight: 600; }}
+p {{ text-align: center; font-size: 14px; color: #6b7280; }}
+p a {{ color: #4f46e5; }}
+</style>
+</head>
+<body>
+<header><a href="{site_url}/">Credit Card Comparator</a></header>
+<main>
+<h2>Comparing <span>{card1_name}</span> vs <span>{card2_name}</span></h2>
+<table>
+<tr><th>Feature</th>{card_headers}</tr>
+{rows}
+</table>
+<p><a href="{site_url}/">Compare other cards</a></p>
+</main>
+</body>
+</html>
+"""
+
+
+def compare_payload(cards: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
+    """The cards and formatted comparison rows, as served by /api/compare."""
+    return {
+        "cards": [as_card_info(card) for card in cards],
+        "rows": build_comparison_rows(cards),
+    }
+
+
+def _digest(payload: Dict[str, Any]) -> str:
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def render_compare_html(payload: Dict[str, Any], site_url: str = "") -> str:
+    """
+    Render a standalone compare page for one pair.
+
+    Args:
+        payload: Result of compare_payload
+        site_url (str): Frontend origin for links back into the app; the
+            page is served by the backend, which may be another origin
+    """
+    cards = payload["cards"]
+    escape = html.escape
+    card_headers = "".join(
+        f'<th><img src="{escape(card["issuer_logo_url"])}" '
+        f'alt="{escape(card["name"])} logo"><span>{escape(card["name"])}</span></th>'
+        for card in cards
+    )
+    rows = "\n".join(
+        "<tr><td>{}</td>{}</tr>".format(
+            escape(row["feature_label"]),
+            "".join(f"<td>{escape(str(value))}</td>" for value in row["values"]),
+        )
+        for row in payload["rows"]
+    )
+    return PAGE_TEMPLATE.format(
+        title=escape(f"{cards[0]['name']} vs {cards[1]['name']}"),
+        site_url=escape(site_url.rstrip("/")),
+        dynamic_url=escape(f"/compare/{cards[0]['id']}/{cards[1]['id']}"),
+        card1_name=escape(cards[0]["name"]),
+        card2_name=escape(cards[1]["name"]),
+        card_headers=card_headers,
+        rows=rows,
+    )
+
+
+def _page_name(pair: Pair) -> str:
+    # Ids go into file names, so keep only characters that are safe there
+    return "--".join(
+        "".join(c if c.isalnum() or c in "-_" else "_" for c in card_id)
+        for card_id in pair
+    )
+
+
+def prerender_compare_pages(
+    cards_by_id: Mapping[str, Mapping[str, Any]],
+    pairs: Sequence[Pair],
+    output_dir: str = PRERENDERED_DIR,
+    site_url: str = "",
+) -> Dict[str, Any]:
+    """
+    Write static HTML and JSON for each pair, replacing earlier output.
+
+    Pairs with an unknown card or the same card twice are skipped. The
+    directory is swapped in as a whole, so a reader never sees a mix of
+    old and new pages.
+
+    Args:
+        cards_by_id: Catalog cards by id
+        pairs: (card1_id, card2_id) pairs, in priority order
+        output_dir (str): Directory for the pages and manifest
+        site_url (str): Frontend origin for links back into the app
+
+    Returns:
+        dict: The manifest that was written
+    """
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=parent, prefix=".compare-")
+    entries: Dict[str, Dict[str, str]] = {}
+    try:
+        for pair in pairs:
+            key = "/".join(pair)
+            if key in entries or pair[0] == pair[1]:
+                continue
+            if pair[0] not in cards_by_id or pair[1] not in cards_by_id:
+                print(f"Skipping {key}: card not found")
+                continue
+            payload = compare_payload([cards_by_id[pair[0]], cards_by_id[pair[1]]])
+            name = _page_name(pair)
+            with open(os.path.join(staging, f"{name}.html"), "w", encoding="utf-8") as f:
+                f.write(render_compare_html(payload, site_url))
+            with open(os.path.join(staging, f"{name}.json"), "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            entries[key] = {
+                "html": f"{name}.html",
+                "json": f"{name}.json",
+                "digest": _digest(payload),
+            }
+        manifest = {"generated_at": int(time.time()), "pairs": entries}
+        with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        previous = None
+        if os.path.exists(output_dir):
+            previous = output_dir + ".old"
+            shutil.rmtree(previous, ignore_errors=True)
+            os.replace(output_dir, previous)
+        os.replace(staging, output_dir)
+        if previous:
+            shutil.rmtree(previous, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return manifest
+
+
+def read_pairs_file(path: str) -> List[Pair]:
+    """
+    Read "card1_id card2_id" lines; commas also separate ids.
+
+    Blank lines and lines starting with # are ignored.
+    """
+    pairs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].replace(",", " ").split()
+            if len(line) == 2:
+                pairs.append((line[0], line[1]))
+    return pairs
+
+
+def fetch_popular_pairs(counts_url: str, limit: int) -> List[Pair]:
+    """Read the most compared pairs from a worker's /api/stats/popular-pairs."""
+    separator = "&" if "?" in counts_url else "?"
+    with urllib.request.urlopen(
+        f"{counts_url}{separator}limit={limit}", timeout=30
+    ) as response:
+        data = json.loads(response.read().decode("utf-8"))
+    return [tuple(entry["card_ids"]) for entry in data]
+
+
+# (manifest mtime, pairs, served file name -> (media type, ETag))
+_manifest_cache: Tuple[
+    Optional[int], Dict[str, Any], Dict[str, Tuple[str, str]]
+] = (None, {}, {})
+
+
+def _read_manifest() -> Tuple[Dict[str, Any], Dict[str, Tuple[str, str]]]:
+    global _manifest_cache
+    path = os.path.join(PRERENDERED_DIR, MANIFEST_FILE)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}, {}
+    if _manifest_cache[0] != mtime:
+        try:
+            with open(path, encoding="utf-8") as f:
+                pairs = json.load(f).get("pairs", {})
+        except (OSError, ValueError) as e:
+            print(f"Could not read {path}: {e}")
+            pairs = {}
+        files = {}
+        for entry in pairs.values():
+            files[entry["html"]] = ("text/html", f'"{entry["digest"]}-html"')
+            files[entry["json"]] = ("application/json", f'"{entry["digest"]}-json"')
+        _manifest_cache = (mtime, pairs, files)
+    return _manifest_cache[1], _manifest_cache[2]
+
+
+def read_prerendered_file(file_name: str) -> Optional[Tuple[bytes, str, str]]:
+    """
+    A prerendered page listed in the current manifest.
+
+    Only names from the manifest are read, so request paths never reach
+    arbitrary files.
+
+    Args:
+        file_name (str): Page or JSON file name, e.g. "12--34.html"
+
+    Returns:
+        tuple: (content, media type, ETag), or None when not prerendered
+    """
+    _, files = _read_manifest()
+    listed = files.get(file_name)
+    if listed is None:
+        return None
+    try:
+        with open(os.path.join(PRERENDERED_DIR, file_name), "rb") as f:
+            content = f.read()
+    except OSError:
+        return None
+    return content, listed[0], listed[1]
+
+
+def prerendered_compare_url(
+    cards: Sequence[Mapping[str, Any]],
+) -> Optional[str]:
+    """
+    Backend path of the static page for these two cards, if it is up to date.
+
+    A page rendered from older card data than the catalog now holds is
+    ignored, so the caller falls back to the dynamic compare page.
+
+    Args:
+        cards: The two cards, in column order
+
+    Returns:
+        str: Path under PRERENDERED_PATH, or None when there is no current page
+    """
+    pairs, _ = _read_manifest()
+    entry = pairs.get("/".join(card["id"] for card in cards))
+    if entry is None or entry.get("digest") != _digest(compare_payload(cards)):
+        return None
+    return f"{PRERENDERED_PATH}/{entry['html']}"
+
+
+async def _load_cards_by_id() -> Mapping[str, Mapping[str, Any]]:
+    from credit_card_comparison_site.catalog.cache import catalog_cache
+
+    return (await catalog_cache.get()).cards_by_id
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--pairs",
+        default=PRERENDER_PAIRS_PATH,
+        help="file with one 'card1_id card2_id' pair per line",
+    )
+    parser.add_argument(
+        "--counts-url",
+        help="take the most compared pairs from this /api/stats/popular-pairs URL",
+    )
+    parser.add_argument("--top", type=int, default=PRERENDER_TOP_N)
+    parser.add_argument(
+        "--site-url",
+        help="frontend origin for links in the pages (default: the Reflex deploy_url)",
+    )
+    args = parser.parse_args()
+    if args.site_url is None:
+        from reflex.config import get_config
+
+        args.site_url = get_config().deploy_url or ""
+
+    if args.counts_url:
+        pairs = fetch_popular_pairs(args.counts_url, args.top)
+    elif os.path.exists(args.pairs):
+        pairs = read_pairs_file(args.pairs)[:args.top]
+    else:
+        parser.error(f"{args.pairs} not found; pass --pairs or --counts-url")
+    manifest = prerender_compare_pages(
+        asyncio.run(_load_cards_by_id()), pairs, site_url=args.site_url
+    )
+    print(f"Prerendered {len(manifest['pairs'])} compare pages to {PRERENDERED_DIR}")
@@ -0,0 +1,181 @@
+"""
+Build step that writes issuer icons into assets/ as static, content-hashed files.
+
+Run after changing any icon SVG:
+
+    python -m credit_card_comparison_site.utils.icon_assets
+
+Add --sprite to also bundle every Simple Icon referenced by ISSUER_ICON_MAP
+into a single sprite sheet, so the table needs one icon request instead of
+one per issuer. Icons are read from --source-dir (e.g. a local
+node_modules/simple-icons/icons) when given, otherwise downloaded from the
+Simple Icons CDN.
+"""
+
+import argparse
+import json
+import os
+import re
+import urllib.request
+from typing import Dict, List, Optional
+from credit_card_comparison_site.utils.issuer_icons import (
+    ASSETS_DIR,
+    COLORED_BANK_ICON_FILES,
+    CUSTOM_BANK_ICON_SVG,
+    GENERIC_BANK_ICON_FILE,
+    ICON_ASSETS_PATH,
+    ISSUER_ICON_MAP,
+    ISSUER_SPRITE_MANIFEST,
+    SIMPLE_ICONS_CDN,
+    SPRITE_BANK_ICON_ID,
+    content_hashed_name,
+    get_colored_bank_icon_svg,
+)
+
+# Every icon is drawn into a cell of this size in the sprite
+SPRITE_CELL_SIZE = 24
+
+_SVG_ROOT = re.compile(r"<svg\b([^>]*)>(.*)</svg>", re.DOTALL)
+_VIEW_BOX = re.compile(r'viewBox="([^"]+)"')
+
+
+def icon_asset_files() -> Dict[str, str]:
+    """
+    Map every static icon file name to its SVG content.
+
+    Returns:
+        dict: File name under the icons directory to SVG text
+    """
+    files = {GENERIC_BANK_ICON_FILE: CUSTOM_BANK_ICON_SVG}
+    # One variant per brand color in ISSUER_COLORS
+    for color, file_name in COLORED_BANK_ICON_FILES.items():
+        files[file_name] = get_colored_bank_icon_svg(color)
+    return files
+
+
+def _icons_dir(assets_dir: str) -> str:
+    icons_dir = os.path.join(assets_dir, ICON_ASSETS_PATH.strip("/"))
+    os.makedirs(icons_dir, exist_ok=True)
+    return icons_dir
+
+
+def export_icon_assets(assets_dir: str = ASSETS_DIR) -> List[str]:
+    """
+    Write icon files that are missing from assets_dir.
+
+    Files are named by content hash, so an existing file never needs to be
+    rewritten.
+
+    Args:
+        assets_dir (str): Root assets directory
+
+    Returns:
+        list: Paths of the files that were written
+    """
+    icons_dir = _icons_dir(assets_dir)
+    written = []
+    for file_name, svg in icon_asset_files().items():
+        path = os.path.join(icons_dir, file_name)
+        if os.path.exists(path):
+            continue
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(svg)
+        written.append(path)
+    return written
+
+
+def _read_simple_icon(icon_slug: str, source_dir: Optional[str]) -> str:
+    if source_dir:
+        with open(
+            os.path.join(source_dir, f"{icon_slug}.svg"), encoding="utf-8"
+        ) as f:
+            return f.read()
+    with urllib.request.urlopen(
+        f"{SIMPLE_ICONS_CDN}/{icon_slug}.svg", timeout=10
+    ) as response:
+        return response.read().decode("utf-8")
+
+
+def _sprite_cell(icon_id: str, svg: str, index: int) -> str:
+    match = _SVG_ROOT.search(svg)
+    if match is None:
+        raise ValueError(f"{icon_id}: not an SVG document")
+    attributes, body = match.groups()
+    view_box = _VIEW_BOX.search(attributes)
+    y = index * SPRITE_CELL_SIZE
+    return (
+        f'<view id="{icon_id}" viewBox="0 {y} {SPRITE_CELL_SIZE} {SPRITE_CELL_SIZE}"/>'
+        f'<svg x="0" y="{y}" width="{SPRITE_CELL_SIZE}" height="{SPRITE_CELL_SIZE}"'
+        f' viewBox="{view_box.group(1) if view_box else "0 0 24 24"}">{body}</svg>'
+    )
+
+
+def build_issuer_sprite(
+    source_dir: Optional[str] = None, assets_dir: str = ASSETS_DIR
+) -> str:
+    """
+    Bundle the issuer icons into one SVG sprite with a <view> per icon.
+
+    Each icon is addressable as "<sprite>.svg#<slug>" from an <img> tag, and
+    the generic bank icon as "#bank". A manifest next to the sprite lists
+    the bundled ids; get_issuer_icon_url reads it on import.
+
+    Args:
+        source_dir (str): Directory with Simple Icons SVGs, or None to download
+        assets_dir (str): Root assets directory
+
+    Returns:
+        str: Path of the sprite file
+    """
+    icons = {SPRITE_BANK_ICON_ID: CUSTOM_BANK_ICON_SVG}
+    for icon_slug in dict.fromkeys(ISSUER_ICON_MAP.values()):
+        try:
+            icons[icon_slug] = _read_simple_icon(icon_slug, source_dir)
+        except (OSError, ValueError) as e:
+            # Left out of the sprite; the resolver keeps using the CDN URL
+            print(f"Skipping icon {icon_slug}: {e}")
+
+    cells = [
+        _sprite_cell(icon_id, svg, index)
+        for index, (icon_id, svg) in enumerate(icons.items())
+    ]
+    sprite = (
+        '<svg xmlns="http://www.w3.org/2000/svg"'
+        f' viewBox="0 0 {SPRITE_CELL_SIZE} {SPRITE_CELL_SIZE * len(cells)}">'
+        + "".join(cells)
+        + "</svg>"
+    )
+
+    icons_dir = _icons_dir(assets_dir)
+    file_name = content_hashed_name("issuers", sprite)
+    for old_file in os.listdir(icons_dir):
+        # Drop sprites from earlier builds
+        if re.fullmatch(r"issuers-[0-9a-f]{8}\.svg", old_file) and old_file != file_name:
+            os.remove(os.path.join(icons_dir, old_file))
+    sprite_path = os.path.join(icons_dir, file_name)
+    with open(sprite_path, "w", encoding="utf-8") as f:
+        f.write(sprite)
+    manifest_path = os.path.join(
+        icons_dir, os.path.basename(ISSUER_SPRITE_MANIFEST)
+    )
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"file": file_name, "icons": list(icons)}, f, indent=2)
+    return sprite_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sprite",
+        action="store_true",
+        help="also bundle the Simple Icons used by ISSUER_ICON_MAP into one sprite",
+    )
+    parser.add_argument(
+        "--source-dir",
+        help="read Simple Icons SVGs from this directory instead of the CDN",
+    )
+    args = parser.parse_args()
+    for path in export_icon_assets():
+        print(f"Wrote {path}")
+    if args.sprite:
+        print(f"Wrote {build_issuer_sprite(args.source_dir)}")
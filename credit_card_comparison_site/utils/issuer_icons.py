@@ -3,6 +3,15 @@ Utility module for mapping credit card issuers to their Simple Icons.
 Provides fallback to custom bank icon when specific issuer icon is not available.
 """
 
+import base64
+import hashlib
+import json
+import os
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
 # Simple Icons CDN base URL
 SIMPLE_ICONS_CDN = "https://cdn.jsdelivr.net/npm/simple-icons@v10/icons"
 
@@ -10,9 +19,110 @@ SIMPLE_ICONS_CDN = "https://cdn.jsdelivr.net/npm/simple-icons@v10/icons"
 CUSTOM_BANK_ICON_SVG = """<svg viewBox="0 0 1024 1024" class="icon" version="1.1" xmlns="http://www.w3.org/2000/svg" fill="#000000"><g id="SVGRepo_bgCarrier" stroke-width="0"></g><g id="SVGRepo_tracerCarrier" stroke-linecap="round" stroke-linejoin="round"></g><g id="SVGRepo_iconCarrier"><path d="M511.8 154.1L916 277v45.7H108V277l403.8-122.9m0-46L64 244.4v122.3h896V244.4L511.8 108.1zM113 831.4h798v16H113z" fill="#39393A"></path><path d="M113 391.1h798v16H113z" fill="#E73B37"></path><path d="M64.3 871.8h895.3v44H64.3zM204.2 475.6v287.3h52v44h-120v-44h52V475.6h-52v-44h120v44zM414.7 475.6v287.3h52v44h-120v-44h52V475.6h-52v-44h120v44zM625.2 475.6v287.3h52v44h-120v-44h52V475.6h-52v-44h120v44zM835.8 475.6v287.3h52v44h-120v-44h52V475.6h-52v-44h120v44z" fill="#39393A"></path></g></svg>"""
 
 # Convert custom SVG to data URL
-import base64
 GENERIC_BANK_ICON = f"data:image/svg+xml;base64,{base64.b64encode(CUSTOM_BANK_ICON_SVG.encode()).decode()}"
 
+# Static icons live under assets/ and are named by content hash, so they can
+# be cached forever and rows only carry a short path instead of a data URL
+ICON_ASSETS_PATH = "/icons"
+
+# Where card rows link the icons. The default is the frontend's copy of
+# assets/; point it at the backend's /icons route (e.g.
+# "https://api.example.com/icons") to get immutable cache headers
+ICON_BASE_URL = os.getenv("ICON_BASE_URL", ICON_ASSETS_PATH).rstrip("/")
+
+# File names produced by content_hashed_name
+_HASHED_ICON_NAME = re.compile(r"[A-Za-z0-9_-]+-([0-9a-f]{8})\.svg")
+
+
+def content_hashed_name(prefix: str, content: str, extension: str = "svg") -> str:
+    """
+    Build a file name that changes whenever the content changes.
+
+    Args:
+        prefix (str): Readable start of the file name
+        content (str): File content to hash
+        extension (str): File extension without the dot
+
+    Returns:
+        str: e.g. "bank-1a2b3c4d.svg"
+    """
+    digest = hashlib.sha256(content.encode()).hexdigest()[:8]
+    return f"{prefix}-{digest}.{extension}"
+
+
+GENERIC_BANK_ICON_FILE = content_hashed_name("bank", CUSTOM_BANK_ICON_SVG)
+GENERIC_BANK_ICON_URL = f"{ICON_BASE_URL}/{GENERIC_BANK_ICON_FILE}"
+
+# Project assets directory, served by Reflex at the site root
+ASSETS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "assets",
+)
+
+# Written by `python -m credit_card_comparison_site.utils.icon_assets --sprite`;
+# lists the sprite file and the icon ids it contains
+ISSUER_SPRITE_MANIFEST = os.path.join(
+    ASSETS_DIR, ICON_ASSETS_PATH.strip("/"), "issuers-sprite.json"
+)
+
+# Sprite id of the generic bank icon
+SPRITE_BANK_ICON_ID = "bank"
+
+
+def _load_sprite_manifest(path: str) -> Tuple[Optional[str], FrozenSet[str]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        return manifest["file"], frozenset(manifest["icons"])
+    except FileNotFoundError:
+        return None, frozenset()
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Ignoring invalid icon sprite manifest {path}: {e}")
+        return None, frozenset()
+
+
+_SPRITE_FILE, _SPRITE_ICONS = _load_sprite_manifest(ISSUER_SPRITE_MANIFEST)
+
+
+def read_icon_file(file_name: str) -> Optional[Tuple[bytes, str]]:
+    """
+    A content-hashed icon from assets/icons, for serving from the backend.
+
+    Only names in the content_hashed_name format are read, so request
+    paths never reach other files.
+
+    Args:
+        file_name (str): e.g. "bank-1a2b3c4d.svg"
+
+    Returns:
+        tuple: (content, ETag), or None when there is no such icon
+    """
+    match = _HASHED_ICON_NAME.fullmatch(file_name)
+    if match is None:
+        return None
+    path = os.path.join(ASSETS_DIR, ICON_ASSETS_PATH.strip("/"), file_name)
+    try:
+        with open(path, "rb") as f:
+            return f.read(), f'"{match.group(1)}"'
+    except OSError:
+        return None
+
+
+def get_sprite_icon_url(icon_id: str) -> Optional[str]:
+    """
+    Get a fragment reference into the local icon sprite.
+
+    Args:
+        icon_id (str): Simple Icons slug, or SPRITE_BANK_ICON_ID
+
+    Returns:
+        str: e.g. "/icons/issuers-1a2b3c4d.svg#chase", or None if the icon
+        is not bundled
+    """
+    if _SPRITE_FILE is None or icon_id not in _SPRITE_ICONS:
+        return None
+    return f"{ICON_BASE_URL}/{_SPRITE_FILE}#{icon_id}"
+
 # Mapping of issuer names to their Simple Icons slug
 ISSUER_ICON_MAP = {
     # Major Banks
@@ -58,41 +168,181 @@ ISSUER_ICON_MAP = {
 }
 
 def get_default_icon_url() -> str:
-    return GENERIC_BANK_ICON
+    """URL of the generic bank icon, served as a static asset."""
+    return get_sprite_icon_url(SPRITE_BANK_ICON_ID) or GENERIC_BANK_ICON_URL
 
-def get_issuer_icon_url(issuer_name: str) -> str:
+
+def localize_icon_url(icon_url: str) -> str:
     """
-    Get the Simple Icons URL for a given issuer name.
-    
+    Swap a Simple Icons CDN URL for its local sprite reference when bundled.
+
+    Args:
+        icon_url (str): Logo URL, e.g. as stored in the issuers table
+
+    Returns:
+        str: Local sprite reference, or icon_url unchanged
+    """
+    prefix = f"{SIMPLE_ICONS_CDN}/"
+    if not icon_url.startswith(prefix) or not icon_url.endswith(".svg"):
+        return icon_url
+    icon_slug = icon_url[len(prefix):-len(".svg")]
+    return get_sprite_icon_url(icon_slug) or icon_url
+
+class _AliasMatcher:
+    """
+    Aho-Corasick automaton over lowercased issuer aliases.
+
+    A single pass over a name finds every alias it contains and reports the
+    one that comes first in ISSUER_ICON_MAP.
+    """
+
+    def __init__(self, aliases: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Lowest alias rank ending at each state, including via fail links
+        self._best: List[Optional[int]] = [None]
+        for rank, alias in enumerate(aliases):
+            state = 0
+            for char in alias:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            if self._best[state] is None:
+                self._best[state] = rank
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._best[child] = _min_rank(
+                    self._best[child], self._best[self._fail[child]]
+                )
+
+    def first_contained(self, text: str) -> Optional[int]:
+        """Lowest rank among aliases that occur in text, or None."""
+        best = self._best[0]
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            best = _min_rank(best, self._best[state])
+        return best
+
+
+def _min_rank(left: Optional[int], right: Optional[int]) -> Optional[int]:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return min(left, right)
+
+
+def _build_issuer_icon_index() -> None:
+    global _ALIAS_SLUGS, _NORMALIZED_ALIASES, _ALIAS_SUBSTRINGS, _ALIAS_MATCHER
+    aliases = [issuer.lower() for issuer in ISSUER_ICON_MAP]
+    _ALIAS_SLUGS = list(ISSUER_ICON_MAP.values())
+
+    # First alias wins when two differ only by case
+    _NORMALIZED_ALIASES = {}
+    for rank, alias in enumerate(aliases):
+        _NORMALIZED_ALIASES.setdefault(alias, rank)
+
+    # Every substring of every alias, for names that are part of an alias
+    _ALIAS_SUBSTRINGS = {}
+    for rank, alias in enumerate(aliases):
+        for start in range(len(alias) + 1):
+            for end in range(start, len(alias) + 1):
+                _ALIAS_SUBSTRINGS.setdefault(alias[start:end], rank)
+
+    _ALIAS_MATCHER = _AliasMatcher(aliases)
+
+
+_ALIAS_SLUGS: List[str] = []
+_NORMALIZED_ALIASES: Dict[str, int] = {}
+_ALIAS_SUBSTRINGS: Dict[str, int] = {}
+_ALIAS_MATCHER: Optional[_AliasMatcher] = None
+_build_issuer_icon_index()
+
+
+@lru_cache(maxsize=4096)
+def resolve_issuer_icon_slug(issuer_name: str, partial: bool = True) -> Optional[str]:
+    """
+    Get the Simple Icons slug for an issuer name.
+
+    Matching order: exact name, case-insensitive name, then the first
+    ISSUER_ICON_MAP entry that contains the name or is contained in it.
+
     Args:
         issuer_name (str): The name of the credit card issuer
-        
+        partial (bool): Also try the containment match, which can pick the
+            wrong issuer (e.g. "Citizens Bank" matches "Citi")
+
     Returns:
-        str: URL to the issuer's icon or custom bank icon if not found
+        str: Icon slug, or None when no issuer matches
     """
     if not issuer_name:
-        return GENERIC_BANK_ICON
-    
+        return None
+
     # Clean up the issuer name for better matching
     cleaned_name = issuer_name.strip()
-    
+
     # Try exact match first
     if cleaned_name in ISSUER_ICON_MAP:
-        icon_slug = ISSUER_ICON_MAP[cleaned_name]
-        return f"{SIMPLE_ICONS_CDN}/{icon_slug}.svg"
-    
+        return ISSUER_ICON_MAP[cleaned_name]
+
     # Try case-insensitive match
-    for issuer, icon_slug in ISSUER_ICON_MAP.items():
-        if issuer.lower() == cleaned_name.lower():
-            return f"{SIMPLE_ICONS_CDN}/{icon_slug}.svg"
-    
+    lowered_name = cleaned_name.lower()
+    rank = _NORMALIZED_ALIASES.get(lowered_name)
+    if rank is not None:
+        return _ALIAS_SLUGS[rank]
+    if not partial:
+        return None
+
     # Try partial match (for cases like "Chase Bank" -> "Chase")
-    for issuer, icon_slug in ISSUER_ICON_MAP.items():
-        if issuer.lower() in cleaned_name.lower() or cleaned_name.lower() in issuer.lower():
-            return f"{SIMPLE_ICONS_CDN}/{icon_slug}.svg"
+    rank = _min_rank(
+        _ALIAS_MATCHER.first_contained(lowered_name),
+        _ALIAS_SUBSTRINGS.get(lowered_name),
+    )
+    if rank is not None:
+        return _ALIAS_SLUGS[rank]
+    return None
+
+
+def rebuild_issuer_icon_index() -> None:
+    """Rebuild the resolver after ISSUER_ICON_MAP is changed at runtime."""
+    _build_issuer_icon_index()
+    resolve_issuer_icon_slug.cache_clear()
+
+
+def get_issuer_icon_url(issuer_name: str) -> str:
+    """
+    Get the icon URL for a given issuer name.
+
+    Icons bundled into the local sprite are returned as fragment references
+    into it; others use the Simple Icons CDN.
     
-    # Return custom bank icon if no match found
-    return GENERIC_BANK_ICON
+    Args:
+        issuer_name (str): The name of the credit card issuer
+        
+    Returns:
+        str: URL to the issuer's icon or custom bank icon if not found
+    """
+    icon_slug = resolve_issuer_icon_slug(issuer_name)
+    if icon_slug is None:
+        # Return custom bank icon if no match found
+        return get_default_icon_url()
+    # Prefer the bundled sprite so the page needs one icon request
+    return get_sprite_icon_url(icon_slug) or f"{SIMPLE_ICONS_CDN}/{icon_slug}.svg"
 
 def get_issuer_icon_data_url(issuer_name: str, color: str = "#000000") -> str:
     """
@@ -110,9 +360,31 @@ def get_issuer_icon_data_url(issuer_name: str, color: str = "#000000") -> str:
     # In the future, this could fetch and modify SVG colors
     return get_issuer_icon_url(issuer_name)
 
+def get_colored_bank_icon_svg(color: str) -> str:
+    """
+    Get the custom bank icon SVG with its dark fill replaced by color.
+
+    Args:
+        color (str): Hex color code for the icon
+
+    Returns:
+        str: SVG markup
+    """
+    return CUSTOM_BANK_ICON_SVG.replace('fill="#39393A"', f'fill="{color}"')
+
+
+@lru_cache(maxsize=256)
+def _colored_bank_icon_data_url(color: str) -> str:
+    colored_svg = get_colored_bank_icon_svg(color)
+    return f"data:image/svg+xml;base64,{base64.b64encode(colored_svg.encode()).decode()}"
+
+
 def get_custom_bank_icon_with_color(color: str = "#39393A") -> str:
     """
     Get the custom bank icon with a specific color.
+
+    Brand colors from ISSUER_COLORS are precomputed at import; other colors
+    are encoded once and kept in a bounded cache.
     
     Args:
         color (str): Hex color code for the icon
@@ -120,13 +392,44 @@ def get_custom_bank_icon_with_color(color: str = "#39393A") -> str:
     Returns:
         str: Data URL for the colored SVG icon
     """
-    colored_svg = CUSTOM_BANK_ICON_SVG.replace('fill="#39393A"', f'fill="{color}"')
-    return f"data:image/svg+xml;base64,{base64.b64encode(colored_svg.encode()).decode()}"
+    precomputed = COLORED_BANK_ICONS.get(color)
+    if precomputed is not None:
+        return precomputed
+    return _colored_bank_icon_data_url(color)
+
+
+def colored_bank_icon_file(color: str) -> str:
+    """Content-hashed asset file name for a colored bank icon."""
+    return content_hashed_name(
+        f"bank-{color.lstrip('#').lower()}", get_colored_bank_icon_svg(color)
+    )
+
+
+def get_custom_bank_icon_asset_url(color: str = "#39393A") -> str:
+    """
+    Get a static URL for the colored bank icon when one is exported.
+
+    Brand colors from ISSUER_COLORS are written to assets/ by the icon_assets
+    build step; any other color falls back to a data URL.
+
+    Args:
+        color (str): Hex color code for the icon
+
+    Returns:
+        str: Static asset URL, or a data URL for colors without an asset
+    """
+    file_name = COLORED_BANK_ICON_FILES.get(color)
+    if file_name is None:
+        return get_custom_bank_icon_with_color(color)
+    return f"{ICON_BASE_URL}/{file_name}"
 
 def update_issuer_icons_in_database():
     """
     SQL script to update all issuer logo_url fields with Simple Icons URLs.
     This function returns the SQL commands to run.
+
+    Prefer `python -m credit_card_comparison_site.catalog.issuer_sync`, which
+    only writes the rows that changed, in a single batched upsert.
     
     Returns:
         str: SQL UPDATE statements
@@ -166,6 +469,15 @@ ISSUER_COLORS = {
     "USAA": "#003366",
 }
 
+# Colored bank icon variants for every brand color, built once at import
+COLORED_BANK_ICONS: Dict[str, str] = {
+    color: _colored_bank_icon_data_url(color)
+    for color in ISSUER_COLORS.values()
+}
+COLORED_BANK_ICON_FILES: Dict[str, str] = {
+    color: colored_bank_icon_file(color) for color in ISSUER_COLORS.values()
+}
+
 def get_issuer_color(issuer_name: str) -> str:
     """
     Get the brand color for an issuer.